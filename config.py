@@ -2,9 +2,39 @@
 Configuration management for Spotify DJ application.
 Handles API settings and model configurations.
 """
+import functools
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
+# Load .env exactly once, before any class below reads the environment
+load_dotenv()
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm_api_key():
+    """
+    Get the OpenRouter API key, read from the environment once.
+
+    Raises:
+        ValueError: If OPENROUTER_API_KEY is not set.
+    """
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "Missing OpenRouter API key. Please set OPENROUTER_API_KEY in .env file."
+        )
+    return api_key
+
+
+@dataclass(frozen=True)
+class SpotifyCreds:
+    """Immutable Spotify OAuth credentials."""
+
+    client_id: str
+    client_secret: str
+    redirect_uri: str
+
 
 class LLMConfig:
     """Configuration for LLM (OpenRouter) settings."""
@@ -18,25 +48,35 @@ class LLMConfig:
     # API timeout in seconds
     TIMEOUT = 30
 
-    # API key (loaded from environment via .env)
-    API_KEY = None  # Will be set by loading .env
+    # Retry attempts for 429/5xx responses from OpenRouter
+    RETRY_ATTEMPTS = 3
+
+    # Backoff factor between retries in seconds (0.3, 0.6, 1.2, ...)
+    RETRY_BACKOFF = 0.3
 
-    @classmethod
-    def _load_api_key(cls):
-        """Load API key from environment (from .env file)."""
-        if cls.API_KEY is None:
-            load_dotenv()
-            cls.API_KEY = os.getenv("OPENROUTER_API_KEY")
+    # Request OpenRouter JSON mode and trust the reply as strict JSON.
+    # Set False for models without response_format support.
+    JSON_MODE = True
+
+    # Add provider prompt-cache breakpoints (used for anthropic/* models)
+    PROMPT_CACHE = True
+
+    # Number of recent queue suggestions to memoize
+    SUGGESTION_CACHE_SIZE = 64
+
+    # Once history grows past this many messages, older ones are summarized
+    HISTORY_SUMMARIZE_THRESHOLD = 20
+
+    # Newest messages kept verbatim after summarizing
+    HISTORY_RECENT_MESSAGES = 6
+
+    # Estimated history tokens that also trigger summarizing, however few messages
+    HISTORY_TOKEN_BUDGET = 4000
 
     @classmethod
     def get_api_key(cls):
         """Get the OpenRouter API key."""
-        cls._load_api_key()
-        if not cls.API_KEY:
-            raise ValueError(
-                "Missing OpenRouter API key. Please set OPENROUTER_API_KEY in .env file."
-            )
-        return cls.API_KEY
+        return get_llm_api_key()
 
     @classmethod
     def get_model(cls):
@@ -57,6 +97,21 @@ class SpotifyConfig:
     CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET")
     REDIRECT_URI = os.getenv("SPOTIFY_REDIRECT_URI", "http://localhost:8888/callback")
 
+    # Maximum concurrent track searches when resolving a suggested queue
+    MAX_SEARCH_WORKERS = 16
+
+    # Client-side token bucket for Spotify Web API requests: sustained
+    # requests per second, and how many may go out back-to-back
+    RATE_LIMIT_PER_SECOND = 10
+    RATE_LIMIT_BURST = 20
+
+    # Persistent (title, artist) -> URI cache
+    URI_CACHE_ENABLED = True
+    URI_CACHE_PATH = "cache/uri_cache.sqlite3"
+
+    # Seconds before a cached "not found" result is searched again (7 days)
+    URI_CACHE_NEGATIVE_TTL = 7 * 24 * 60 * 60
+
     # Required scopes for the application
     SCOPES = [
         "user-read-playback-state",
@@ -64,18 +119,24 @@ class SpotifyConfig:
     ]
 
     @classmethod
+    @functools.cache
     def get_credentials(cls):
-        """Get Spotify credentials."""
+        """
+        Get Spotify credentials, built once and reused.
+
+        Returns:
+            SpotifyCreds: Frozen client_id/client_secret/redirect_uri record.
+        """
         if not cls.CLIENT_ID or not cls.CLIENT_SECRET:
             raise ValueError(
                 "Missing Spotify credentials. Please set SPOTIFY_CLIENT_ID and "
                 "SPOTIFY_CLIENT_SECRET in .env file."
             )
-        return {
-            "client_id": cls.CLIENT_ID,
-            "client_secret": cls.CLIENT_SECRET,
-            "redirect_uri": cls.REDIRECT_URI,
-        }
+        return SpotifyCreds(
+            client_id=cls.CLIENT_ID,
+            client_secret=cls.CLIENT_SECRET,
+            redirect_uri=cls.REDIRECT_URI,
+        )
 
 
 class JITConfig:
@@ -84,18 +145,33 @@ class JITConfig:
     # Seconds before song ends to trigger injection
     INJECTION_THRESHOLD = 15
 
-    # Seconds between playback status checks
+    # Seconds between playback status checks near the injection window
     POLL_INTERVAL = 1.5
 
+    # Bounds on the adaptive poll delay used away from the injection window
+    MIN_POLL_INTERVAL = 0.2
+    MAX_POLL_INTERVAL = 30
+
     # Minimum songs to keep in Spotify's queue
     MIN_QUEUE_SIZE = 1
 
     # Retry attempts for failed injections
     RETRY_ATTEMPTS = 3
 
-    # Delay between retry attempts in seconds
+    # Base delay between retry attempts in seconds; doubles on each attempt
     RETRY_DELAY = 0.5
 
+    # Upper bound on a single retry delay, including a 429's Retry-After
+    RETRY_MAX_DELAY = 30
+
+    # Consecutive 429 responses before injections pause, and for how long (seconds)
+    RATE_LIMIT_MAX_CONSECUTIVE = 3
+    RATE_LIMIT_COOLDOWN = 10
+
+
+# Resolved once at import
+DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+
 
 class AppConfig:
     """General application configuration."""
@@ -104,7 +180,14 @@ class AppConfig:
     APP_NAME = "Spotify DJ"
 
     # Enable debug mode
-    DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+    DEBUG = DEBUG
+
+    # Seconds to wait for the background Spotify queue prefetch before
+    # falling back to the last fetched queue
+    QUEUE_PREFETCH_TIMEOUT = 2
+
+    # Seconds a fetched Spotify queue is reused before it is fetched again
+    QUEUE_CACHE_TTL = 30
 
     @classmethod
     def validate_config(cls):
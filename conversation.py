@@ -3,13 +3,21 @@ Conversation History Management.
 Stores and manages user and assistant messages throughout a session.
 """
 
+# Rough average for English text; close enough for budgeting without a tokenizer
+_CHARS_PER_TOKEN = 4
+
 
 class ConversationHistory:
     """Manages conversation history formatted for LLM API consumption."""
 
+    # Messages stay plain {"role", "content"} dicts: that is the chat API's
+    # wire format, so they go into the request payload without conversion
+    __slots__ = ("messages", "summary")
+
     def __init__(self):
         """Initialize empty conversation list."""
         self.messages = []
+        self.summary = ""  # Condensed form of messages dropped by compact()
 
     def add_user_message(self, text):
         """
@@ -29,6 +37,24 @@ class ConversationHistory:
         """
         self.messages.append({"role": "assistant", "content": text})
 
+    def commit_turn(self, user, assistant):
+        """
+        Record a completed turn: the user's message and the assistant's reply.
+
+        Callers stage the turn locally and only commit it once it succeeded,
+        so a failed turn never has to be unwound.
+
+        Args:
+            user (str): The user's message content.
+            assistant (str): The assistant's response content.
+        """
+        self.messages.extend(
+            (
+                {"role": "user", "content": user},
+                {"role": "assistant", "content": assistant},
+            )
+        )
+
     def get_history(self):
         """
         Get the full conversation history in format suitable for LLM API.
@@ -40,6 +66,36 @@ class ConversationHistory:
         """
         return self.messages.copy()
 
+    def estimate_tokens(self):
+        """
+        Approximate the prompt size of the history and running summary.
+
+        Returns:
+            int: Estimated token count (about 4 characters per token).
+        """
+        chars = len(self.summary) + sum(len(m["content"]) for m in self.messages)
+        return chars // _CHARS_PER_TOKEN
+
+    def compact(self, summarize, keep_recent):
+        """
+        Fold all but the newest messages into the running summary.
+
+        Args:
+            summarize (callable): summarize(previous_summary, messages) -> str
+            keep_recent (int): Number of newest messages to keep verbatim.
+
+        Returns:
+            bool: True if messages were summarized and dropped.
+        """
+        old_count = len(self.messages) - keep_recent
+        if old_count <= 0:
+            return False
+
+        self.summary = summarize(self.summary, self.messages[:old_count])
+        del self.messages[:old_count]
+        return True
+
     def clear(self):
         """Reset conversation history to empty."""
         self.messages = []
+        self.summary = ""
@@ -2,14 +2,41 @@
 Thread-safe JSONL logging for debugging Spotify DJ sessions.
 
 Provides a DebugWriter class that writes structured debug data to a JSONL file.
-Thread-safe operations using threading.Lock for concurrent access.
+Log calls only enqueue the entry; a background writer thread serializes and
+writes entries in batches so callers never block on file I/O.
 """
 
 import json
+import queue
+import sys
 import time
 import os
 import threading
 
+# Maximum entries pending for the writer thread before new ones are dropped
+_MAX_PENDING = 10000
+
+# Maximum entries serialized into a single write
+_BATCH_SIZE = 64
+
+# Longest the writer thread keeps written entries in its buffer before flushing
+_FLUSH_INTERVAL = 1.0
+
+# Enqueued by close() to stop the writer thread
+_STOP = object()
+
+# Compact separators: smaller lines and less work per entry than json.dumps' defaults
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Wall-clock time at monotonic zero, captured once: entry timestamps are
+# monotonic (never jump on NTP adjustments) but still readable as Unix times
+_WALL_OFFSET = time.time() - time.monotonic()
+
+
+def _now():
+    """Current time as a Unix timestamp that only ever moves forward."""
+    return time.monotonic() + _WALL_OFFSET
+
 
 class DebugWriter:
     """Thread-safe JSONL debug logger for Spotify DJ sessions."""
@@ -24,13 +51,82 @@ class DebugWriter:
         self.enabled = enabled
         self._lock = threading.Lock()
         self._file = None
+        self._queue = None
+        self._thread = None
+        self.dropped = 0  # Entries discarded because the writer fell behind
 
         if self.enabled:
             os.makedirs("logs/", exist_ok=True)
             timestamp = int(time.time())
             pid = os.getpid()
             filename = f"logs/session_{timestamp}_{pid}.jsonl"
-            self._file = open(filename, "a", buffering=1)
+            # Block-buffered: the writer thread decides when to flush
+            self._file = open(filename, "a")
+            self._queue = queue.Queue(maxsize=_MAX_PENDING)
+            self._thread = threading.Thread(
+                target=self._drain, name="debug-writer", daemon=True
+            )
+            self._thread.start()
+
+    def __bool__(self):
+        """
+        A disabled writer is falsy.
+
+        Callers guard on ``if debug_writer:`` before building entries, so a
+        DebugWriter(enabled=False) skips that work just like passing None.
+        """
+        return self.enabled
+
+    def _enqueue(self, entry):
+        """Hand an entry to the writer thread without blocking the caller."""
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Warn once; close() reports the total
+            if not self.dropped:
+                print("Debug log queue full, dropping entries", file=sys.stderr)
+            self.dropped += 1
+
+    def _drain(self):
+        """
+        Writer thread: serialize queued entries and write them in batches.
+
+        The file is flushed once the queue is drained, or at least every
+        _FLUSH_INTERVAL seconds under a steady stream, so monitor.py still sees
+        entries promptly without a write syscall per line.
+        """
+        last_flush = time.monotonic()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < _BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            lines = []
+            for entry in batch:
+                if entry is _STOP:
+                    stop = True
+                    continue
+                try:
+                    lines.append(_ENCODER.encode(entry) + "\n")
+                except (TypeError, ValueError) as e:
+                    print(f"Error serializing debug log entry: {e}", file=sys.stderr)
+
+            if lines:
+                try:
+                    self._file.write("".join(lines))
+                    now = time.monotonic()
+                    if self._queue.empty() or now - last_flush >= _FLUSH_INTERVAL:
+                        self._file.flush()
+                        last_flush = now
+                except IOError as e:
+                    print(f"Error writing debug log: {e}", file=sys.stderr)
+
+            if stop:
+                return
 
     def log_cycle(self, data):
         """
@@ -42,11 +138,7 @@ class DebugWriter:
         if not self.enabled:
             return
 
-        with self._lock:
-            try:
-                self._file.write(json.dumps(data) + "\n")
-            except IOError as e:
-                print(f"Error writing cycle log: {e}", file=__import__("sys").stderr)
+        self._enqueue(data)
 
     def log_event(self, event_type, data):
         """
@@ -59,12 +151,7 @@ class DebugWriter:
         if not self.enabled:
             return
 
-        with self._lock:
-            try:
-                entry = {"type": event_type, "data": data}
-                self._file.write(json.dumps(entry) + "\n")
-            except IOError as e:
-                print(f"Error writing event log: {e}", file=__import__("sys").stderr)
+        self._enqueue({"type": event_type, "data": data})
 
     def log_error(self, error):
         """
@@ -76,29 +163,39 @@ class DebugWriter:
         if not self.enabled:
             return
 
-        with self._lock:
-            try:
-                entry = {
-                    "type": "error",
-                    "error": str(error) if not isinstance(error, str) else error,
-                    "timestamp": time.time(),
-                }
-                self._file.write(json.dumps(entry) + "\n")
-            except IOError as e:
-                print(f"Error writing error log: {e}", file=__import__("sys").stderr)
+        self._enqueue(
+            {
+                "type": "error",
+                "error": str(error) if not isinstance(error, str) else error,
+                "timestamp": _now(),
+                "monotonic": time.monotonic(),
+            }
+        )
 
     def close(self):
-        """Close the log file and flush any buffered data."""
+        """Drain pending entries, then close the log file and flush any buffered data."""
         if not self.enabled:
             return
 
         with self._lock:
+            if self._thread:
+                self._queue.put(_STOP)
+                self._thread.join()
+                self._thread = None
+
+            if self.dropped:
+                print(
+                    f"Debug log dropped {self.dropped} entries while the writer was behind",
+                    file=sys.stderr,
+                )
+
             if self._file:
                 try:
                     self._file.flush()
+                    os.fsync(self._file.fileno())
                     self._file.close()
                 except IOError as e:
-                    print(f"Error closing log file: {e}", file=__import__("sys").stderr)
+                    print(f"Error closing log file: {e}", file=sys.stderr)
                 finally:
                     self._file = None
 
@@ -118,7 +215,7 @@ def create_cycle_snapshot(cycle_num, playing, shadow_queue, injection_state):
     """
     return {
         "cycle_num": cycle_num,
-        "timestamp": int(time.time()),
+        "timestamp": int(_now()),
         "playing": playing,
         "shadow_queue": shadow_queue,
         "injection_state": injection_state,
@@ -136,4 +233,4 @@ def create_event(event_type, details):
     Returns:
         dict: JSON-serializable event data
     """
-    return {"event_type": event_type, "timestamp": int(time.time()), "details": details}
+    return {"event_type": event_type, "timestamp": int(_now()), "details": details}
@@ -4,13 +4,70 @@ Provides queue suggestions based on user input and current queue state.
 """
 
 import json
+import re
+from collections import OrderedDict
+from typing import NamedTuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import LLMConfig
 
 
+# Markdown code fence around a JSON payload (```json ... ```)
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+# Shared decoder for raw_decode scans; JSONDecoder is stateless between calls
+_JSON_DECODER = json.JSONDecoder()
+
+# Per-turn user message: serialized queue, then the user's request
+_CONTEXT_TEMPLATE = "Current Queue:\n%s\n\nUser Request: %s"
+
+# Keys every suggested song must carry
+_REQUIRED_SONG_KEYS = frozenset(("title", "artist"))
+
+
+class SuggestedSong(NamedTuple):
+    """Compact (title, artist) record for suggestions held across turns."""
+
+    title: str
+    artist: str
+
+    def as_dict(self):
+        """Return the {"title": ..., "artist": ...} form used at API boundaries."""
+        return {"title": self.title, "artist": self.artist}
+
+
 class LLMClient:
     """Client for interacting with OpenRouter API to get queue suggestions."""
 
+    # Built once at import; reused for every request
+    SYSTEM_PROMPT = """You are a DJ curator assistant. Your job is to help users manage their Spotify queue based on their requests.
+
+When a user sends a message, you will:
+1. Receive the current queue state as JSON
+2. Receive their request (mood, genre, specific songs, etc.)
+3. Suggest a new queue that fulfills their request
+
+IMPORTANT:
+- You must ALWAYS respond with valid JSON in exactly this format:
+  {"queue": [{"title": "Song Name", "artist": "Artist Name"}, {"title": "Another Song", "artist": "Another Artist"}]}
+- Your entire response must be a single JSON object. No markdown. No code fences. No extra keys.
+- Do not ask clarifying questions. If the request is ambiguous, make a reasonable best-guess.
+- If you cannot comply, return an empty queue: {"queue": []}
+
+The queue should be an array of songs with "title" and "artist" fields. You can:
+- Keep some existing songs if they fit the request
+- Add new song suggestions
+- Reorder songs
+- Remove songs
+
+Be creative and suggest songs that match the user's mood or preference. Always respond with valid JSON only - no other text."""
+
+    SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+    SUMMARY_PROMPT = """You condense a music DJ chat into durable facts.
+Given an optional previous summary and the newest turns, write at most 200 tokens of plain text capturing the listener's stated preferences, dislikes, moods, artists and genres, and any standing instructions. Drop chatter and song counts. Output only the summary."""
+
     def __init__(self, api_key=None):
         """
         Initialize LLM client with OpenRouter API key.
@@ -29,6 +86,39 @@ class LLMClient:
         self.model = LLMConfig.get_model()
         self.timeout = LLMConfig.get_timeout()
 
+        # With OpenRouter JSON mode on, the assistant content is trusted as strict JSON
+        self._strict_json = LLMConfig.JSON_MODE
+
+        # Persistent session so every turn reuses the pooled keep-alive connection
+        self._session = requests.Session()
+        retry = Retry(
+            total=LLMConfig.RETRY_ATTEMPTS,
+            backoff_factor=LLMConfig.RETRY_BACKOFF,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry)
+        self._session.mount("https://", adapter)
+        self._session.headers.update(
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            }
+        )
+
+        # Last serialized queue as (queue snapshot, compact JSON string)
+        self._queue_json_cache = (None, None)
+
+        # Anthropic models need explicit cache_control breakpoints; other
+        # providers (OpenAI, Grok, Gemini) cache matching prefixes automatically
+        self._explicit_prompt_cache = LLMConfig.PROMPT_CACHE and self.model.startswith(
+            "anthropic/"
+        )
+
+        # LRU of (history, queue, message) -> tuple of SuggestedSong
+        self._suggestion_cache = OrderedDict()
+
     def _get_system_prompt(self):
         """
         Get the system prompt for the DJ curator LLM.
@@ -36,84 +126,76 @@ class LLMClient:
         Returns:
             str: System prompt instructions for the LLM.
         """
-        return """You are a DJ curator assistant. Your job is to help users manage their Spotify queue based on their requests.
-
-When a user sends a message, you will:
-1. Receive the current queue state as JSON
-2. Receive their request (mood, genre, specific songs, etc.)
-3. Suggest a new queue that fulfills their request
+        return self.SYSTEM_PROMPT
 
-IMPORTANT:
-- You must ALWAYS respond with valid JSON in exactly this format:
-  {"queue": [{"title": "Song Name", "artist": "Artist Name"}, {"title": "Another Song", "artist": "Another Artist"}]}
-- Your entire response must be a single JSON object. No markdown. No code fences. No extra keys.
-- Do not ask clarifying questions. If the request is ambiguous, make a reasonable best-guess.
-- If you cannot comply, return an empty queue: {"queue": []}
+    @staticmethod
+    def _mark_cache_breakpoints(messages):
+        """
+        Mark the system prompt and the last history message as cacheable.
 
-The queue should be an array of songs with "title" and "artist" fields. You can:
-- Keep some existing songs if they fit the request
-- Add new song suggestions
-- Reorder songs
-- Remove songs
+        Rewrites those entries in place to the content-part form with
+        cache_control, so only the newest user turn is billed uncached.
 
-Be creative and suggest songs that match the user's mood or preference. Always respond with valid JSON only - no other text."""
+        Args:
+            messages (list): Chat messages; the last one is the new turn.
+        """
+        breakpoints = {0}
+        if len(messages) > 2:
+            breakpoints.add(len(messages) - 2)
 
-    def get_queue_suggestion(self, conversation_history, current_queue, user_message):
+        for i in breakpoints:
+            message = messages[i]
+            if not isinstance(message.get("content"), str):
+                continue
+            messages[i] = {
+                "role": message["role"],
+                "content": [
+                    {
+                        "type": "text",
+                        "text": message["content"],
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+            }
+
+    def _serialize_queue(self, current_queue):
         """
-        Get a queue suggestion from the LLM based on user input and current queue state.
+        Serialize the queue as compact JSON, reusing the last result if unchanged.
 
         Args:
-            conversation_history (list): List of dicts with format:
-                [{"role": "user", "content": "..."}, {"role": "assistant", "content": "..."}]
-            current_queue (list): Current queue as list of dicts:
-                [{"title": "Song Name", "artist": "Artist Name"}, ...]
-            user_message (str): The user's new request/message.
+            current_queue (list): Current queue as list of dicts.
 
         Returns:
-            list: Suggested queue as list of dicts:
-                [{"title": "Song Name", "artist": "Artist Name"}, ...]
-
-        Raises:
-            ValueError: If the response is not valid JSON or missing required fields.
-            requests.RequestException: If the API call fails.
+            str: Compact JSON encoding of the queue.
         """
-        # Build the messages for the API call
-        messages = []
-        system_message = {"role": "system", "content": self._get_system_prompt()}
-
-        # Prepend a system message unless the caller already provided one.
-        if not conversation_history or conversation_history[0].get("role") != "system":
-            messages.append(system_message)
+        cached_queue, cached_json = self._queue_json_cache
+        if cached_json is not None and cached_queue == current_queue:
+            return cached_json
 
-        # Add conversation history
-        messages.extend(conversation_history)
+        queue_json = json.dumps(current_queue, separators=(",", ":"))
+        self._queue_json_cache = ([dict(song) for song in current_queue], queue_json)
+        return queue_json
 
-        # Add current queue context and user message
-        context_message = f"""Current Queue:
-{json.dumps(current_queue, indent=2)}
-
-User Request: {user_message}"""
-
-        messages.append({"role": "user", "content": context_message})
+    def _post_chat(self, payload):
+        """
+        Send a chat completion request and return the assistant message text.
 
-        # Make the API call
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        Args:
+            payload (dict): OpenRouter chat completion request body.
 
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            # OpenRouter JSON mode: guarantees the assistant message is valid JSON.
-            # Docs: https://openrouter.ai/docs/api/reference/parameters
-            "response_format": {"type": "json_object"},
-        }
+        Returns:
+            str: Content of the first choice's assistant message.
 
-        response = requests.post(
+        Raises:
+            ValueError: If the response is not JSON or has an unexpected schema.
+            requests.RequestException: If the API call fails.
+        """
+        # Encode the body ourselves (compact, UTF-8); Content-Type is set on the session
+        response = self._session.post(
             self.api_endpoint,
-            headers=headers,
-            json=payload,
+            data=json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode(
+                "utf-8"
+            ),
             timeout=self.timeout,
         )
 
@@ -127,7 +209,8 @@ User Request: {user_message}"""
 
         # Parse the response
         try:
-            response_data = response.json()
+            # Decode straight from the raw body bytes, skipping the str round-trip
+            response_data = json.loads(response.content)
         except ValueError as e:
             body = response.text
             snippet = body if len(body) <= 2000 else body[:2000] + "..."
@@ -144,17 +227,138 @@ User Request: {user_message}"""
                 f"Unexpected OpenRouter response schema; expected choices[0].message.content. Got keys: {list(response_data.keys())}"
             ) from e
 
+        return assistant_message
+
+    def summarize_history(self, previous_summary, messages):
+        """
+        Condense older conversation turns into a short running summary.
+
+        Args:
+            previous_summary (str): Summary of even older turns ("" if none).
+            messages (list): Messages being folded into the summary, oldest first.
+
+        Returns:
+            str: Updated summary text.
+
+        Raises:
+            ValueError: If the response has an unexpected schema.
+            requests.RequestException: If the API call fails.
+        """
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        if previous_summary:
+            transcript = (
+                f"Previous summary:\n{previous_summary}\n\nNew turns:\n{transcript}"
+            )
+
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.SUMMARY_PROMPT},
+                {"role": "user", "content": transcript},
+            ],
+        }
+        return self._post_chat(payload).strip()
+
+    def get_queue_suggestion(
+        self, conversation_history, current_queue, user_message, summary=""
+    ):
+        """
+        Get a queue suggestion from the LLM based on user input and current queue state.
+
+        Args:
+            conversation_history (list): List of dicts with format:
+                [{"role": "user", "content": "..."}, {"role": "assistant", "content": "..."}]
+            current_queue (list): Current queue as list of dicts:
+                [{"title": "Song Name", "artist": "Artist Name"}, ...]
+            user_message (str): The user's new request/message.
+            summary (str, optional): Running summary of turns no longer in
+                conversation_history; sent as a system message after the prompt.
+
+        Returns:
+            list: Suggested queue as list of dicts:
+                [{"title": "Song Name", "artist": "Artist Name"}, ...]
+
+        Raises:
+            ValueError: If the response is not valid JSON or missing required fields.
+            requests.RequestException: If the API call fails.
+        """
+        cache_key = (
+            tuple((m["role"], m["content"]) for m in conversation_history),
+            tuple((s.get("title"), s.get("artist")) for s in current_queue),
+            user_message,
+            summary,
+        )
+        cached = self._suggestion_cache.get(cache_key)
+        if cached is not None:
+            self._suggestion_cache.move_to_end(cache_key)
+            return [song.as_dict() for song in cached]
+
+        # Prepend a system message unless the caller already provided one.
+        if not conversation_history or conversation_history[0].get("role") != "system":
+            prefix = (self.SYSTEM_MESSAGE.copy(),)
+        else:
+            prefix = ()
+        if summary:
+            prefix += (
+                {
+                    "role": "system",
+                    "content": f"Summary of the earlier conversation: {summary}",
+                },
+            )
+
+        # Add current queue context and user message
+        context_message = _CONTEXT_TEMPLATE % (
+            self._serialize_queue(current_queue),
+            user_message,
+        )
+
+        # Build the messages in one allocation: system + history + new turn.
+        # Order stays stable (static prompt first, newest turn last) so provider
+        # prefix caching can reuse everything before the new turn.
+        messages = [
+            *prefix,
+            *conversation_history,
+            {"role": "user", "content": context_message},
+        ]
+        if self._explicit_prompt_cache:
+            self._mark_cache_breakpoints(messages)
+
+        # Make the API call
+        payload = {
+            "model": self.model,
+            "messages": messages,
+        }
+        if self._strict_json:
+            # OpenRouter JSON mode: guarantees the assistant message is valid JSON.
+            # Docs: https://openrouter.ai/docs/api/reference/parameters
+            payload["response_format"] = {"type": "json_object"}
+
+        assistant_message = self._post_chat(payload)
+
         # Extract JSON from the response
-        queue_json = self._extract_json_from_response(assistant_message)
+        queue_json = self._extract_json_from_response(
+            assistant_message, strict=self._strict_json
+        )
+        suggested_queue = queue_json["queue"]
+
+        # Empty answers are not cached so a retry gets a fresh attempt
+        if suggested_queue:
+            self._suggestion_cache[cache_key] = tuple(
+                SuggestedSong(song["title"], song["artist"]) for song in suggested_queue
+            )
+            if len(self._suggestion_cache) > LLMConfig.SUGGESTION_CACHE_SIZE:
+                self._suggestion_cache.popitem(last=False)
 
-        return queue_json["queue"]
+        return suggested_queue
 
-    def _extract_json_from_response(self, response_text):
+    def _extract_json_from_response(self, response_text, strict=False):
         """
         Extract and validate JSON from LLM response.
 
         Args:
             response_text (str): The LLM's response text.
+            strict (bool): If True, the text is parsed as-is with no markdown or
+                brace-scan fallbacks (used when JSON mode was requested).
 
         Returns:
             dict: Parsed JSON with format {"queue": [...]}
@@ -162,7 +366,17 @@ User Request: {user_message}"""
         Raises:
             ValueError: If the response doesn't contain valid JSON in the expected format.
         """
-        import re
+        # JSON mode: the whole response is the JSON object, parse it directly
+        if strict:
+            try:
+                parsed = json.loads(response_text)
+            except json.JSONDecodeError as e:
+                raise ValueError(
+                    f"LLM response is not valid JSON despite JSON mode: {response_text}"
+                ) from e
+            queue_json = self._normalize_queue_response(parsed)
+            self._validate_queue_structure(queue_json)
+            return queue_json
 
         # Try to parse the entire response as JSON first
         try:
@@ -176,7 +390,7 @@ User Request: {user_message}"""
             return queue_json
 
         # Try to extract JSON from markdown code blocks (```json...```)
-        json_match = re.search(r"```(?:json)?\s*(.*?)\s*```", response_text, re.DOTALL)
+        json_match = _FENCE_RE.search(response_text)
         if json_match:
             try:
                 queue_json = json.loads(json_match.group(1))
@@ -186,14 +400,35 @@ User Request: {user_message}"""
             except (json.JSONDecodeError, ValueError):
                 pass
 
-        # Try to locate the first valid JSON object/array substring.
-        decoder = json.JSONDecoder()
-        for i, ch in enumerate(response_text):
-            if ch not in "{[":
+        # Try the outermost {...} / [...] span; one decode covers prose-wrapped JSON.
+        for opener, closer in ("{}", "[]"):
+            start = response_text.find(opener)
+            end = response_text.rfind(closer)
+            if start == -1 or end <= start:
                 continue
             try:
-                parsed, _ = decoder.raw_decode(response_text[i:])
+                queue_json = json.loads(response_text[start : end + 1])
+                queue_json = self._normalize_queue_response(queue_json)
+                self._validate_queue_structure(queue_json)
+                return queue_json
+            except ValueError:
+                pass
+
+        # Fall back to locating the first valid JSON object/array substring.
+        i = 0
+        while True:
+            starts = [
+                pos
+                for pos in (response_text.find("{", i), response_text.find("[", i))
+                if pos != -1
+            ]
+            if not starts:
+                break
+            i = min(starts)
+            try:
+                parsed, _ = _JSON_DECODER.raw_decode(response_text, i)
             except json.JSONDecodeError:
+                i += 1
                 continue
 
             queue_json = self._normalize_queue_response(parsed)
@@ -204,7 +439,8 @@ User Request: {user_message}"""
             f"Could not extract valid JSON from LLM response: {response_text}"
         )
 
-    def _normalize_queue_response(self, data):
+    @staticmethod
+    def _normalize_queue_response(data):
         """
         Normalize the queue response to the expected format.
 
@@ -227,7 +463,8 @@ User Request: {user_message}"""
             f"Unexpected JSON format; expected {{'queue': [...]}}. Got: {type(data)}"
         )
 
-    def _validate_queue_structure(self, queue_json):
+    @staticmethod
+    def _validate_queue_structure(queue_json):
         """
         Validate the queue structure.
 
@@ -245,8 +482,16 @@ User Request: {user_message}"""
                 f"'queue' field must be a list. Got: {type(queue_json['queue'])}"
             )
 
-        # Validate each queue item
-        for item in queue_json["queue"]:
+        queue = queue_json["queue"]
+
+        # Fast path: one pass of C-level type and key-view subset checks
+        if all(
+            type(item) is dict and _REQUIRED_SONG_KEYS <= item.keys() for item in queue
+        ):
+            return
+
+        # Slow path: find the offending item for the error message
+        for item in queue:
             if not isinstance(item, dict):
                 raise ValueError(f"Queue items must be dicts. Got: {type(item)}")
             if "title" not in item or "artist" not in item:
@@ -4,33 +4,50 @@ Integrates SpotifyClient, LLMClient, JITQueueSync, and ConversationHistory.
 """
 
 import sys
-from spotify_client import SpotifyClient
-from llm_client import LLMClient
-from queue_sync import JITQueueSync
-from conversation import ConversationHistory
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import argparse
-from debug_writer import DebugWriter
+
+# Inputs that end the session
+_EXIT_KEYWORDS = frozenset({"exit", "quit", "bye", "stop"})
+
+# Number of songs shown in the queue preview
+_PREVIEW_SIZE = 5
+
+# Background worker that fetches the Spotify queue while the user is typing
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+
+_RULE = "=" * 60
+
+_WELCOME_BANNER = "\n".join(
+    [
+        "",
+        _RULE,
+        "🎵  Welcome to Spotify DJ!",
+        _RULE,
+        "Tell me what you'd like to listen to - describe your mood,",
+        "suggest a genre, or ask for specific songs.",
+        "\nExamples:",
+        "  'I want some upbeat indie rock'",
+        "  'Switch to chill lo-fi beats'",
+        "  'Add some jazz'",
+        "\nType 'exit', 'quit', or 'bye' to leave.",
+        _RULE + "\n\n",
+    ]
+)
 
 
 def display_welcome():
     """Display welcome message to the user."""
-    print("\n" + "=" * 60)
-    print("🎵  Welcome to Spotify DJ!")
-    print("=" * 60)
-    print("Tell me what you'd like to listen to - describe your mood,")
-    print("suggest a genre, or ask for specific songs.")
-    print("\nExamples:")
-    print("  'I want some upbeat indie rock'")
-    print("  'Switch to chill lo-fi beats'")
-    print("  'Add some jazz'")
-    print("\nType 'exit', 'quit', or 'bye' to leave.")
-    print("=" * 60 + "\n")
+    sys.stdout.write(_WELCOME_BANNER)
+    sys.stdout.flush()
 
 
 def should_exit(user_input):
-    """Check if user wants to exit."""
-    exit_keywords = {"exit", "quit", "bye", "stop"}
-    return user_input.strip().lower() in exit_keywords
+    """Check if user wants to exit (expects input already stripped by main())."""
+    return user_input.casefold() in _EXIT_KEYWORDS
 
 
 def format_queue_for_display(queue):
@@ -38,23 +55,38 @@ def format_queue_for_display(queue):
     if not queue:
         return "Queue is empty"
 
-    lines = []
-    for i, song in enumerate(queue):  # Show first 5 songs
-        title = song.get("title", "Unknown")
-        artist = song.get("artist", "Unknown Artist")
-        lines.append(f"  {i}. {title} by {artist}")
+    # Show first few songs without copying the queue
+    preview = "\n".join(
+        f"  {i}. {song.get('title', 'Unknown')} by {song.get('artist', 'Unknown Artist')}"
+        for i, song in enumerate(islice(queue, _PREVIEW_SIZE), 1)
+    )
+    if len(queue) > _PREVIEW_SIZE:
+        preview += f"\n  ... and {len(queue) - _PREVIEW_SIZE} more"
+
+    return preview
+
 
-    return "\n".join(lines)
+def fetch_queue_stamped(spotify_client):
+    """Fetch the Spotify queue and record when the fetch completed."""
+    queue = spotify_client.get_current_queue()
+    return time.monotonic(), queue
 
 
 def main():
     """Main CLI loop for Spotify DJ."""
     print("Spotify DJ starting...")
 
+    # Imported here so `--help` and argument errors skip requests/spotipy load time
+    from config import AppConfig, LLMConfig
+    from spotify_client import get_shared_client
+    from llm_client import LLMClient
+    from queue_sync import JITQueueSync
+    from conversation import ConversationHistory
+
     # Initialize components
     try:
         print("Initializing Spotify client...")
-        spotify_client = SpotifyClient()
+        spotify_client = get_shared_client()
 
         print("Initializing LLM client...")
         llm_client = LLMClient()
@@ -62,6 +94,9 @@ def main():
         conversation_history = ConversationHistory()
         jit_sync = None
         jit_started = False
+        queue_future = None
+        cached_queue = None  # Last fetched Spotify queue and when it was fetched
+        cached_queue_at = 0.0
 
         print("✓ All components initialized\n")
     except ValueError as e:
@@ -77,6 +112,14 @@ def main():
     # Main loop
     while True:
         try:
+            # Overlap the Spotify queue fetch with user think time, unless the
+            # last fetch is still fresh
+            queue_age = time.monotonic() - cached_queue_at
+            if queue_future is None and (
+                cached_queue is None or queue_age > AppConfig.QUEUE_CACHE_TTL
+            ):
+                queue_future = _EXECUTOR.submit(fetch_queue_stamped, spotify_client)
+
             # TODO: add some basic functions like pause, skip
             # Get user input
             user_input = input("You: ").strip()
@@ -99,9 +142,10 @@ def main():
                             else 0
                         },
                     )
-                print("\n" + "=" * 60)
-                print("Thanks for using Spotify DJ! Enjoy the music! 🎵")
-                print("=" * 60)
+                sys.stdout.write(
+                    f"\n{_RULE}\nThanks for using Spotify DJ! Enjoy the music! 🎵\n{_RULE}\n"
+                )
+                sys.stdout.flush()
                 break
 
             # Fetch current queue from Spotify
@@ -109,58 +153,67 @@ def main():
             try:
                 # TODO: we have JIT queue, this queue will usually be empty or only have 1 song
                 # TODO: this for some reason repeats the currently playing song?
-                current_queue = spotify_client.get_current_queue()
-                print(f"✓ Current queue has {len(current_queue)} song(s)")
+                if queue_future is not None:
+                    try:
+                        # Only wait briefly when a stale copy can stand in; the
+                        # cache ages from when the fetch finished, not from here
+                        cached_queue_at, cached_queue = queue_future.result(
+                            timeout=AppConfig.QUEUE_PREFETCH_TIMEOUT
+                            if cached_queue is not None
+                            else None
+                        )
+                        queue_future = None
+                    except FutureTimeoutError:
+                        # Leave the fetch running; its result is used next turn
+                        print(
+                            "(Spotify is slow to respond, using the last known queue)"
+                        )
+                    except Exception:
+                        queue_future = None
+                        raise
+                current_queue = cached_queue
+                status = f"✓ Current queue has {len(current_queue)} song(s)\n"
                 if current_queue:
-                    print("Currently playing:")
-                    print(
-                        f"  {current_queue[0]['title']} by {current_queue[0]['artist']}"
+                    status += (
+                        "Currently playing:\n"
+                        f"  {current_queue[0]['title']} by {current_queue[0]['artist']}\n"
                     )
+                sys.stdout.write(status)
             except Exception as e:
                 print(f"✗ Error fetching queue: {e}")
                 print("Make sure Spotify is playing on your device")
                 continue
 
-            # Add user message to history
-            conversation_history.add_user_message(user_input)
-
-            # Get LLM suggestion
+            # Get LLM suggestion; history is only written once the turn succeeds
             print("Getting song suggestions from LLM...")
             try:
                 suggested_queue = llm_client.get_queue_suggestion(
                     conversation_history=conversation_history.get_history(),
                     current_queue=current_queue,
                     user_message=user_input,
+                    summary=conversation_history.summary,
                 )
 
                 if not suggested_queue:
                     print("✗ LLM returned an empty queue. Please try again.")
-                    # Remove the user message from history since we're retrying
-                    conversation_history.messages.pop()
                     continue
 
                 print(f"✓ LLM suggested {len(suggested_queue)} song(s)")
                 if debug_writer:
                     debug_writer.log_event(
                         "llm_suggestion",
-                        {"song_count": len(suggested_queue), "songs": suggested_queue},
+                        {
+                            "song_count": len(suggested_queue),
+                            "songs": suggested_queue,
+                        },
                     )
             except ValueError as e:
                 print(f"✗ Error parsing LLM response: {e}")
-                # Remove the user message from history since we're retrying
-                conversation_history.messages.pop()
                 continue
             except Exception as e:
                 print(f"✗ LLM API Error: {e}")
-                # Remove the user message from history since we're retrying
-                conversation_history.messages.pop()
                 continue
 
-            # Store LLM response in history
-            # We'll store a summary of the queue suggestion
-            queue_summary = f"Suggested {len(suggested_queue)} songs"
-            conversation_history.add_assistant_response(queue_summary)
-
             # Start or update JIT queue
             print("Updating queue with new songs...")
             try:
@@ -171,9 +224,6 @@ def main():
 
                     if not jit_sync.start_dj_session(suggested_queue):
                         print("✗ Failed to start DJ session")
-                        # Remove messages from history
-                        conversation_history.messages.pop()
-                        conversation_history.messages.pop()
                         continue
 
                     # Start injection loop in background thread
@@ -194,35 +244,64 @@ def main():
                     # Update existing session
                     if jit_sync is None:
                         raise RuntimeError("JIT queue sync not initialized")
-                    if not jit_sync.update_shadow_queue(suggested_queue):
+                    if jit_sync.queue_manager.matches(suggested_queue):
+                        # Same songs as before: skip re-resolving every URI
+                        print("✓ Queue already matches suggestion")
+                    elif not jit_sync.update_shadow_queue(suggested_queue):
                         print("✗ Failed to update queue")
-                        # Remove messages from history
-                        conversation_history.messages.pop()
-                        conversation_history.messages.pop()
                         continue
-                    print("✓ Queue updated with new suggestions")
+                    else:
+                        print("✓ Queue updated with new suggestions")
 
             except Exception as e:
                 print(f"✗ Error updating queue: {e}")
-                # Remove messages from history
-                conversation_history.messages.pop()
-                conversation_history.messages.pop()
                 continue
 
+            # The turn succeeded: record it, storing a summary of the suggestion
+            conversation_history.commit_turn(
+                user_input, f"Suggested {len(suggested_queue)} songs"
+            )
+
+            # We just changed playback, so the cached Spotify queue is out of date
+            cached_queue_at = 0.0
+
             # Display feedback
-            print("\nQueue preview:")
-            print(format_queue_for_display(suggested_queue))
-            print()
+            sys.stdout.write(
+                f"\nQueue preview:\n{format_queue_for_display(suggested_queue)}\n\n"
+            )
+            sys.stdout.flush()
+
+            # Keep the prompt bounded: summarize older turns once history grows
+            if (
+                len(conversation_history.messages)
+                > LLMConfig.HISTORY_SUMMARIZE_THRESHOLD
+                or conversation_history.estimate_tokens()
+                > LLMConfig.HISTORY_TOKEN_BUDGET
+            ):
+                try:
+                    conversation_history.compact(
+                        llm_client.summarize_history,
+                        keep_recent=LLMConfig.HISTORY_RECENT_MESSAGES,
+                    )
+                except Exception as e:
+                    # Keep the full history and try again next turn
+                    print(f"✗ Could not summarize conversation history: {e}")
 
         except KeyboardInterrupt:
-            print("\n\n" + "=" * 60)
-            print("Spotify DJ interrupted. Goodbye! 🎵")
-            print("=" * 60)
+            sys.stdout.write(
+                f"\n\n{_RULE}\nSpotify DJ interrupted. Goodbye! 🎵\n{_RULE}\n"
+            )
+            sys.stdout.flush()
             break
         except Exception as e:
             print(f"\n✗ Unexpected Error: {e}")
             print("Please try again or type 'exit' to quit.\n")
 
+    # The injection thread is a daemon; stop it here so it finishes its cycle
+    if jit_sync is not None:
+        jit_sync.stop_session()
+        jit_sync.wait_for_session()
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -232,14 +311,14 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     if args.debug:
-        import os
+        from debug_writer import DebugWriter
 
-        os.makedirs("logs/", exist_ok=True)
         debug_writer = DebugWriter(enabled=True)
     else:
         debug_writer = None
 
     main()
+    _EXECUTOR.shutdown(wait=False, cancel_futures=True)
 
     if debug_writer:
         debug_writer.close()
@@ -5,7 +5,6 @@ Tails the latest debug log session and displays real-time status using Rich.
 """
 
 import argparse
-import glob
 import json
 import os
 import sys
@@ -19,6 +18,17 @@ from rich.panel import Panel
 from rich.text import Text
 from rich.console import Console
 
+# Panels whose content depends on the wall clock rather than on new log lines
+_CLOCK_PANELS = frozenset({"header", "injection_status"})
+_CLOCK_REFRESH_INTERVAL = 1.0
+
+# How much of an existing log to replay on startup; the panels only show recent state
+_STARTUP_TAIL_BYTES = 64 * 1024
+
+# Every state of the fixed-width progress bar, indexed by filled cell count
+_BAR_WIDTH = 30
+_BARS = tuple("━" * i + "─" * (_BAR_WIDTH - i) for i in range(_BAR_WIDTH + 1))
+
 
 class DashboardState:
     def __init__(self):
@@ -35,12 +45,24 @@ class DashboardState:
         self.should_inject = False
         self.already_injected = False
 
+        # Entries are stored pre-formatted so a render is plain concatenation:
+        # events as (time_str, event_type, details_str), errors as (time_str, message)
         self.events = deque(maxlen=10)
         self.errors = deque(maxlen=5)
 
         self.last_update_ts = time.time()
         self.connected_file = ""
 
+        # Layout panels that need regenerating on the next render pass
+        self.dirty = {
+            "header",
+            "now_playing",
+            "shadow_queue",
+            "injection_status",
+            "events_log",
+            "errors_log",
+        }
+
 
 def make_layout():
     layout = Layout(name="root")
@@ -75,6 +97,11 @@ def format_time(seconds):
     return f"{m:02d}:{s:02d}"
 
 
+def format_clock(ts):
+    """Format a Unix timestamp as local HH:MM:SS for the log panels."""
+    return datetime.fromtimestamp(ts).strftime("%H:%M:%S")
+
+
 def generate_now_playing_panel(state):
     progress_percent = (
         min(100, max(0, (state.progress_ms / state.duration_ms) * 100))
@@ -82,9 +109,7 @@ def generate_now_playing_panel(state):
         else 0
     )
 
-    width = 30
-    filled = int(width * (progress_percent / 100))
-    bar = "━" * filled + "─" * (width - filled)
+    bar = _BARS[int(_BAR_WIDTH * (progress_percent / 100))]
 
     content = Text()
     content.append(f"Title: ", style="bold cyan")
@@ -147,11 +172,10 @@ def generate_injection_status_panel(state):
 
 def generate_events_panel(state):
     content = Text()
-    for ts, event_type, details in state.events:
-        time_str = datetime.fromtimestamp(ts).strftime("%H:%M:%S")
+    for time_str, event_type, details in state.events:
         content.append(f"[{time_str}] ", style="dim")
         content.append(f"{event_type}: ", style="bold blue")
-        content.append(f"{str(details)}\n")
+        content.append(f"{details}\n")
 
     return Panel(
         content, title=f"EVENTS LOG (Last {len(state.events)})", border_style="white"
@@ -163,8 +187,7 @@ def generate_errors_panel(state):
     if not state.errors:
         content.append("No errors", style="green")
     else:
-        for ts, error_msg in state.errors:
-            time_str = datetime.fromtimestamp(ts).strftime("%H:%M:%S")
+        for time_str, error_msg in state.errors:
             content.append(f"[{time_str}] {error_msg}\n", style="bold red")
 
     return Panel(content, title="ERRORS", border_style="red")
@@ -190,64 +213,169 @@ def get_log_file(args):
         return args.file
 
     if args.latest:
-        files = glob.glob("logs/session_*.jsonl")
-        if not files:
+        # scandir hands back each entry's stat alongside its name
+        try:
+            with os.scandir("logs") as it:
+                latest = max(
+                    (
+                        entry
+                        for entry in it
+                        if entry.name.startswith("session_")
+                        and entry.name.endswith(".jsonl")
+                    ),
+                    key=lambda entry: entry.stat().st_mtime,
+                    default=None,
+                )
+        except FileNotFoundError:
             return None
-        return max(files, key=os.path.getmtime)
+        return latest.path if latest else None
 
     return None
 
 
-def parse_line(line, state):
-    """Parse a single JSONL line and update state."""
-    try:
-        data = json.loads(line.strip())
-        state.last_update_ts = time.time()
+def _handle_cycle(data, state):
+    playing = data.get("playing", {})
+    state.track_title = playing.get("title", "Unknown")
+    state.track_artist = playing.get("artist", "Unknown")
+    state.progress_ms = playing.get("progress_ms", 0) or 0
+    state.duration_ms = playing.get("duration_ms", 1) or 1
 
-        if "cycle_num" in data:
-            playing = data.get("playing", {})
-            state.track_title = playing.get("title", "Unknown")
-            state.track_artist = playing.get("artist", "Unknown")
-            state.progress_ms = playing.get("progress_ms", 0) or 0
-            state.duration_ms = playing.get("duration_ms", 1) or 1
-
-            shadow = data.get("shadow_queue", {})
-            state.queue_remaining = shadow.get("remaining", 0)
-            next_s = shadow.get("next_song")
-            if next_s:
-                state.next_songs = [next_s]
-            else:
-                state.next_songs = []
+    shadow = data.get("shadow_queue", {})
+    state.queue_remaining = shadow.get("remaining", 0)
+    next_s = shadow.get("next_song")
+    if next_s:
+        state.next_songs = [next_s]
+    else:
+        state.next_songs = []
 
-            injection = data.get("injection_state", {})
-            state.time_until_injection = injection.get("time_until_end", 0)
-            state.should_inject = injection.get("should_inject", False)
-            state.already_injected = injection.get("already_injected", False)
+    injection = data.get("injection_state", {})
+    state.time_until_injection = injection.get("time_until_end", 0)
+    state.should_inject = injection.get("should_inject", False)
+    state.already_injected = injection.get("already_injected", False)
 
-            if state.should_inject and not state.already_injected:
-                pass
+    state.dirty.update(("now_playing", "shadow_queue", "injection_status"))
+
+
+def _handle_error(data, state):
+    state.errors.append(
+        (
+            format_clock(data.get("timestamp", time.time())),
+            data.get("error", "Unknown error"),
+        )
+    )
+    state.dirty.add("errors_log")
 
-        elif data.get("type") == "error":
-            state.errors.append(
-                (data.get("timestamp", time.time()), data.get("error", "Unknown error"))
-            )
 
-        else:
-            evt_type = data.get("type", "unknown")
-            details = data.get("data", {})
-            ts = time.time()
-            if isinstance(details, dict):
-                ts = details.get("timestamp", ts)
+def _handle_event(data, state):
+    evt_type = data.get("type", "unknown")
+    details = data.get("data", {})
+    ts = time.time()
+    if isinstance(details, dict):
+        ts = details.get("timestamp", ts)
 
-            state.events.append((ts, evt_type, details))
+    state.events.append((format_clock(ts), evt_type, str(details)))
+    state.dirty.add("events_log")
 
-            if evt_type == "injection":
-                state.last_injection_time = ts
+    if evt_type == "injection":
+        state.last_injection_time = ts
+        state.dirty.add("injection_status")
+
+
+# Record kind -> handler; anything that is not a cycle snapshot or error is an event
+_HANDLERS = {"cycle": _handle_cycle, "error": _handle_error}
+
+
+def parse_line(line, state):
+    """Parse a single JSONL line and update state."""
+    try:
+        data = json.loads(line)
+        state.last_update_ts = time.time()
+
+        # Cycle snapshots are the bulk of the log; they carry no "type" key
+        kind = "cycle" if "cycle_num" in data else data.get("type")
+        _HANDLERS.get(kind, _handle_event)(data, state)
 
     except json.JSONDecodeError:
         print("Warning: Malformed line, skipping...", file=sys.stderr)
     except Exception as e:
-        state.errors.append((time.time(), f"Monitor Parse Error: {str(e)}"))
+        state.errors.append(
+            (format_clock(time.time()), f"Monitor Parse Error: {str(e)}")
+        )
+        state.dirty.add("errors_log")
+
+
+def seek_to_tail(f, window):
+    """
+    Position a binary log file at the first complete record in its last window bytes.
+
+    Args:
+        f: Log file opened in binary mode
+        window (int): Maximum number of trailing bytes to replay
+    """
+    size = f.seek(0, os.SEEK_END)
+    if size <= window:
+        f.seek(0)
+        return
+    # Start one byte early: if that byte ends a record, readline() consumes
+    # only it and the record starting the window is kept whole
+    f.seek(size - window - 1)
+    f.readline()  # Discard the record the window cut into
+
+
+def read_complete_lines(f, partial):
+    """
+    Read everything appended to the log since the last call.
+
+    The writer flushes in blocks, so the final record may be cut mid-line;
+    that fragment is held back and prepended to the next read.
+
+    Args:
+        f: Log file opened in binary mode
+        partial (bytes): Trailing fragment returned by the previous call
+
+    Returns:
+        tuple: (list of complete lines as bytes, new trailing fragment)
+    """
+    chunk = f.read()
+    if not chunk:
+        return [], partial
+    lines = (partial + chunk).split(b"\n")
+    partial = lines.pop()
+    return lines, partial
+
+
+def bind_panel_renderers(layout, filename):
+    """
+    Resolve every panel's Layout.update and generator once, before the render loop.
+
+    Returns:
+        tuple: (panel_name, update, generate) triples, where generate(state) builds the panel
+    """
+    return (
+        (
+            "header",
+            layout["header"].update,
+            lambda state: generate_header(state, filename),
+        ),
+        ("now_playing", layout["now_playing"].update, generate_now_playing_panel),
+        ("shadow_queue", layout["shadow_queue"].update, generate_shadow_queue_panel),
+        (
+            "injection_status",
+            layout["injection_status"].update,
+            generate_injection_status_panel,
+        ),
+        ("events_log", layout["events_log"].update, generate_events_panel),
+        ("errors_log", layout["errors_log"].update, generate_errors_panel),
+    )
+
+
+def render_dirty_panels(renderers, state):
+    """Regenerate only the panels touched since the last render pass."""
+    dirty = state.dirty
+    for name, update, generate in renderers:
+        if name in dirty:
+            update(generate(state))
+    dirty.clear()
 
 
 def main():
@@ -258,6 +386,12 @@ def main():
         "--latest", action="store_true", help="Watch most recent log file"
     )
 
+    parser.add_argument(
+        "--from-start",
+        action="store_true",
+        help="Replay the whole log on startup instead of only its tail",
+    )
+
     args = parser.parse_args()
 
     console = Console()
@@ -277,33 +411,42 @@ def main():
     state.connected_file = log_path
 
     try:
-        f = open(log_path, "r")
-        for line in f:
-            parse_line(line, state)
+        # Binary mode: json.loads parses bytes, so lines are never decoded
+        f = open(log_path, "rb")
+        if not args.from_start:
+            seek_to_tail(f, _STARTUP_TAIL_BYTES)
+        lines, partial = read_complete_lines(f, b"")
+        for line in lines:
+            if line:
+                parse_line(line, state)
 
     except Exception as e:
         console.print(f"[bold red]Error opening file: {e}[/bold red]")
         sys.exit(1)
 
     layout = make_layout()
+    renderers = bind_panel_renderers(layout, log_path)
 
     try:
-        with Live(layout, refresh_per_second=10, screen=True) as live:
+        # Redraw only after a render pass changed something; the clock panels
+        # guarantee at least one redraw per second (which also picks up resizes)
+        with Live(layout, auto_refresh=False, screen=True) as live:
+            last_clock_refresh = 0.0
             while True:
-                while True:
-                    line = f.readline()
-                    if not line:
-                        break
-                    parse_line(line, state)
-
-                layout["header"].update(generate_header(state, log_path))
-                layout["now_playing"].update(generate_now_playing_panel(state))
-                layout["shadow_queue"].update(generate_shadow_queue_panel(state))
-                layout["injection_status"].update(
-                    generate_injection_status_panel(state)
-                )
-                layout["events_log"].update(generate_events_panel(state))
-                layout["errors_log"].update(generate_errors_panel(state))
+                # Drain everything written since the last pass, then render once
+                lines, partial = read_complete_lines(f, partial)
+                for line in lines:
+                    if line:
+                        parse_line(line, state)
+
+                now = time.monotonic()
+                if now - last_clock_refresh >= _CLOCK_REFRESH_INTERVAL:
+                    state.dirty.update(_CLOCK_PANELS)
+                    last_clock_refresh = now
+
+                if state.dirty:
+                    render_dirty_panels(renderers, state)
+                    live.refresh()
 
                 time.sleep(0.1)
 
@@ -1,16 +1,36 @@
 """
 Queue manager for shadow queue tracking and song injection.
 Maintains the "shadow queue" in Python and provides next song for injection.
-Thread-safe implementation using locks to prevent race conditions.
+Thread-safe via copy-on-write snapshots: readers never lock, writers swap
+an immutable (titles, artists, uris, index) state under a lock.
 """
+import sys
 import threading
-from spotify_client import SpotifyClient
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from spotify_client import get_shared_client
+from config import SpotifyConfig
+from uri_cache import URICache
+
+
+@dataclass(slots=True, frozen=True)
+class Song:
+    """A resolved song; strings are interned since artists repeat across turns."""
+
+    title: str
+    artist: str
+    uri: str
 
 
 class QueueManager:
     """
     Manages a shadow queue of songs to be injected into Spotify playback.
-    Thread-safe implementation using threading.Lock() to synchronize access.
+
+    All queue state lives in one immutable ``(titles, artists, uris, index)``
+    tuple of parallel arrays. Rebinding ``self._state`` is atomic under the GIL,
+    so read methods take a local snapshot without locking. The lock only
+    serializes writers (update_queue and get_next_song) so an advance can never
+    overwrite a freshly swapped queue.
     """
 
     def __init__(self, songs_list, spotify_client=None):
@@ -20,129 +40,211 @@ class QueueManager:
         Args:
             songs_list (list): List of dicts with format [{"title": "...", "artist": "..."}, ...]
             spotify_client (SpotifyClient, optional): Existing SpotifyClient instance.
-                                                      If None, a new one will be created.
+                                                      If None, the shared client is used.
+                                                      Pass the shared client so every
+                                                      search reuses its connection pool
+                                                      and URI cache.
         """
-        self.client = spotify_client or SpotifyClient()
-        self.songs_with_uris = []
-        self.current_index = 0
-        self._lock = threading.Lock()  # Lock for thread-safe access
+        self.client = spotify_client or get_shared_client()
+        self._lock = threading.Lock()  # Serializes writers only
 
         # Convert all songs to URIs immediately
+        self._state = self._build_state(songs_list)
+
+    def _resolve_song(self, song):
+        """
+        Validate a song and look up its Spotify track URI.
+
+        Args:
+            song (dict): Song with format {"title": "...", "artist": "..."}
+
+        Returns:
+            Song: Resolved song, or None if invalid/not found
+        """
+        try:
+            title = song["title"]
+            artist = song["artist"]
+        except (KeyError, TypeError):
+            title = artist = None
+
+        if not (title and artist):
+            print(f"Warning: Skipping song with missing title or artist: {song}")
+            return None
+
+        try:
+            track_uri = self.client.search_track_cached(title, artist)
+        except Exception as e:
+            print(f"Error searching for track '{title}' by '{artist}': {e}")
+            return None
+
+        if not track_uri:
+            print(f"Warning: Could not find '{title}' by '{artist}' on Spotify")
+            return None
+
+        return Song(sys.intern(title), sys.intern(artist), sys.intern(track_uri))
+
+    def _resolve_songs(self, songs_list):
+        """
+        Resolve songs to URIs with concurrent Spotify searches, preserving order.
+
+        Args:
+            songs_list (list): List of dicts with format [{"title": "...", "artist": "..."}, ...]
+
+        Returns:
+            list: Resolved songs in input order; duplicates (same normalized
+                  title/artist) and unresolvable songs are dropped.
+        """
+        # Drop songs that normalize to one already suggested: one search each
+        seen = set()
+        unique_songs = []
         for song in songs_list:
             title = song.get("title")
             artist = song.get("artist")
+            if isinstance(title, str) and isinstance(artist, str):
+                key = URICache.make_key(title, artist)
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique_songs.append(song)
+        songs_list = unique_songs
+
+        if not songs_list:
+            return []
 
-            if not title or not artist:
-                print(f"Warning: Skipping song with missing title or artist: {song}")
-                continue
+        workers = min(SpotifyConfig.MAX_SEARCH_WORKERS, len(songs_list))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._resolve_song, songs_list))
 
-            # Search for track URI
-            track_uri = self.client.search_track(title, artist)
+        return [song for song in results if song is not None]
 
-            if track_uri:
-                self.songs_with_uris.append({
-                    "title": title,
-                    "artist": artist,
-                    "uri": track_uri
-                })
-            else:
-                print(f"Warning: Could not find '{title}' by '{artist}' on Spotify")
+    def _build_state(self, songs_list):
+        """
+        Resolve songs and pack them into a fresh struct-of-arrays state.
+
+        Args:
+            songs_list (list): List of dicts with format [{"title": "...", "artist": "..."}, ...]
+
+        Returns:
+            tuple: (titles, artists, uris, 0) with one entry per resolved song
+        """
+        resolved = self._resolve_songs(songs_list)
+        titles = tuple(song.title for song in resolved)
+        artists = tuple(song.artist for song in resolved)
+        uris = tuple(song.uri for song in resolved)
+        return (titles, artists, uris, 0)
 
     def update_queue(self, new_songs_list):
         """
         Update shadow queue with new songs (mid-session changes).
-        Thread-safe: uses lock to prevent race conditions with injection loop.
-        Preserves current position in queue.
+        Thread-safe: searches run outside the lock, then the new snapshot is
+        swapped in with a single assignment. The queue restarts at its first song.
 
         Args:
             new_songs_list (list): New list of dicts with format [{"title": "...", "artist": "..."}, ...]
         """
-        with self._lock:
-            self.songs_with_uris = []
-            self.current_index = 0
-
-            for song in new_songs_list:
-                title = song.get("title")
-                artist = song.get("artist")
+        state = self._build_state(new_songs_list)
 
-                if not title or not artist:
-                    print(f"Warning: Skipping song with missing title or artist: {song}")
-                    continue
-
-                track_uri = self.client.search_track(title, artist)
-
-                if track_uri:
-                    self.songs_with_uris.append({
-                        "title": title,
-                        "artist": artist,
-                        "uri": track_uri
-                    })
-                else:
-                    print(f"Warning: Could not find '{title}' by '{artist}' on Spotify")
+        with self._lock:
+            self._state = state
 
     def get_next_song(self):
         """
         Pop and return next song tuple (title, artist) or None if empty.
-        Thread-safe: uses lock.
+        Thread-safe: advances the index under the writer lock.
 
         Returns:
             tuple: (title, artist) or None if no more songs
         """
         with self._lock:
-            if self.current_index >= len(self.songs_with_uris):
+            titles, artists, uris, index = self._state
+            if index >= len(uris):
                 return None
 
-            song = self.songs_with_uris[self.current_index]
-            self.current_index += 1
-            return (song["title"], song["artist"])
+            self._state = (titles, artists, uris, index + 1)
+
+        return (titles[index], artists[index])
 
     def peek_next_song(self):
         """
         Look at next song without removing it.
-        Thread-safe: uses lock.
+        Lock-free: reads one state snapshot.
 
         Returns:
             tuple: (title, artist) or None if no more songs
         """
-        with self._lock:
-            if self.current_index >= len(self.songs_with_uris):
-                return None
+        titles, artists, uris, index = self._state
+        if index >= len(uris):
+            return None
 
-            song = self.songs_with_uris[self.current_index]
-            return (song["title"], song["artist"])
+        return (titles[index], artists[index])
 
     def get_next_track_uri(self):
         """
         Get the Spotify URI of the next song to inject (already searched).
-        Thread-safe: uses lock.
+        Lock-free: reads one state snapshot.
 
         Returns:
             str: Spotify track URI or None if no more songs
         """
-        with self._lock:
-            if self.current_index >= len(self.songs_with_uris):
-                return None
+        _, _, uris, index = self._state
+        if index >= len(uris):
+            return None
+
+        return uris[index]
 
-            return self.songs_with_uris[self.current_index]["uri"]
+    def current_keys(self):
+        """
+        Normalized keys of the songs still waiting to be injected, in queue order.
+        Lock-free: reads one state snapshot.
+
+        Returns:
+            tuple: URICache.make_key(title, artist) for each remaining song
+        """
+        titles, artists, _, index = self._state
+        return tuple(
+            URICache.make_key(title, artist)
+            for title, artist in zip(titles[index:], artists[index:])
+        )
+
+    def matches(self, songs_list):
+        """
+        Check whether a suggested list is exactly the remaining queue.
+
+        Order and repeats count: a suggestion that only reorders songs
+        ("play X next") is a change.
+
+        Args:
+            songs_list (list): List of dicts with format [{"title": "...", "artist": "..."}, ...]
+
+        Returns:
+            bool: True if both normalize to the same sequence of (title, artist) keys
+        """
+        suggested = tuple(
+            URICache.make_key(song["title"], song["artist"])
+            for song in songs_list
+            if isinstance(song.get("title"), str)
+            and isinstance(song.get("artist"), str)
+        )
+        return suggested == self.current_keys()
 
     def is_empty(self):
         """
         Check if queue has more songs.
-        Thread-safe: uses lock.
+        Lock-free: reads one state snapshot.
 
         Returns:
             bool: True if no more songs in queue
         """
-        with self._lock:
-            return self.current_index >= len(self.songs_with_uris)
+        _, _, uris, index = self._state
+        return index >= len(uris)
 
     def queue_length(self):
         """
         Get number of songs remaining in shadow queue (not yet injected).
-        Thread-safe: uses lock.
+        Lock-free: reads one state snapshot.
 
         Returns:
             int: Number of remaining songs
         """
-        with self._lock:
-            return max(0, len(self.songs_with_uris) - self.current_index)
+        _, _, uris, index = self._state
+        return max(0, len(uris) - index)
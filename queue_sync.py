@@ -3,13 +3,20 @@ Just-In-Time (JIT) queue synchronization engine.
 Maintains a shadow queue and injects songs at the right moment.
 """
 
+import random
 import time
 import threading
-from spotify_client import SpotifyClient
+from spotipy.exceptions import SpotifyException
+from spotify_client import get_shared_client
 from queue_manager import QueueManager
 from config import JITConfig
 from debug_writer import create_cycle_snapshot, create_event
 
+# Injection state for the current song: ARMED until its next song is injected,
+# FIRED afterwards, back to ARMED when playback moves to another song
+_ARMED = 0
+_FIRED = 1
+
 
 class JITQueueSync:
     """
@@ -22,16 +29,32 @@ class JITQueueSync:
     4. Allows mid-session queue updates
     """
 
+    __slots__ = (
+        "client",
+        "queue_manager",
+        "running",
+        "injection_thread",
+        "last_injected_uri",
+        "last_played_uri",
+        "_inject_state",
+        "debug_writer",
+        "_stop_event",
+        "_cv",
+        "_wakeup",
+        "_consecutive_429",
+        "_rate_limited_until",
+    )
+
     def __init__(self, spotify_client=None, debug_writer=None):
         """
         Initialize JIT queue sync engine.
 
         Args:
             spotify_client (SpotifyClient, optional): Existing SpotifyClient instance.
-                                                      If None, a new one will be created.
+                                                      If None, the shared client is used.
             debug_writer (DebugWriter, optional): Debug logger instance for logging events.
         """
-        self.client = spotify_client or SpotifyClient()
+        self.client = spotify_client or get_shared_client()
         self.queue_manager = None
         self.running = False
         self.injection_thread = None
@@ -39,10 +62,16 @@ class JITQueueSync:
         self.last_played_uri = (
             None  # Track currently playing song to detect when it changes
         )
-        self.already_injected_for_current = (
-            False  # Flag to ensure only one injection per song
-        )
+        self._inject_state = _ARMED  # Ensures only one injection per song
         self.debug_writer = debug_writer
+        # Set by stop_session(); the loop checks it instead of polling a flag
+        self._stop_event = threading.Event()
+        # Wakes the injection loop early on queue updates and stop requests
+        self._cv = threading.Condition()
+        self._wakeup = False
+        # Rate-limit circuit breaker: no injections before this time.monotonic()
+        self._consecutive_429 = 0
+        self._rate_limited_until = 0.0
 
     def start_dj_session(self, initial_queue):
         """
@@ -59,6 +88,9 @@ class JITQueueSync:
             return False
 
         print(f"Starting DJ session with {len(initial_queue)} songs...")
+        # A new session is not stopped yet; reset here, never inside the loop
+        # thread, so a stop_session() racing the thread's startup is not lost
+        self._stop_event.clear()
 
         # Create queue manager and convert all songs to URIs
         self.queue_manager = QueueManager(initial_queue, self.client)
@@ -67,7 +99,8 @@ class JITQueueSync:
             print("Error: No valid songs found in initial queue")
             return False
 
-        # Get first song and start playback
+        # Start playback with the first song only; every later song goes in
+        # through injection so Spotify's user queue is the single source of order
         first_uri = self.queue_manager.get_next_track_uri()
         if not first_uri:
             print("Error: Could not get first track URI")
@@ -78,6 +111,8 @@ class JITQueueSync:
             print("Error: Failed to start playback")
             return False
 
+        # Playing now, so drop it from the shadow queue rather than inject it again
+        self.queue_manager.get_next_song()
         self.last_injected_uri = first_uri
         print(
             f"✓ Playback started, {self.queue_manager.queue_length()} songs queued for injection"
@@ -90,10 +125,10 @@ class JITQueueSync:
 
         This loop:
         - Checks if playback is active
-        - Polls Spotify status at POLL_INTERVAL
+        - Polls Spotify status, sleeping longer in the middle of a track
         - Injects next song when INJECTION_THRESHOLD seconds remain
         - Handles errors gracefully
-        - Stops when queue is exhausted or playback ends
+        - Stops when playback ends (an exhausted queue just idles until updated)
 
         Args:
             max_duration_seconds (int, optional): Maximum session duration in seconds.
@@ -104,84 +139,84 @@ class JITQueueSync:
             return
 
         self.running = True
-        start_time = time.time()
+        start_time = time.monotonic()
 
         print(
             f"Starting injection loop with threshold={JITConfig.INJECTION_THRESHOLD}s, "
             f"poll_interval={JITConfig.POLL_INTERVAL}s"
         )
 
+        # Bound once: read on every cycle
+        debug_writer = self.debug_writer
+        retry_attempts = JITConfig.RETRY_ATTEMPTS
+
         try:
             cycle_num = 0
-            while self.running:
+            while not self._stop_event.is_set():
                 # Check timeout
                 if max_duration_seconds is not None:
-                    elapsed = time.time() - start_time
+                    elapsed = time.monotonic() - start_time
                     if elapsed > max_duration_seconds:
                         print(f"Session timeout ({max_duration_seconds}s) reached")
                         break
 
-                # Check if playback is active
+                # One playback fetch per cycle; everything below reads from it
                 status = self.client.get_playback_status()
                 if status is None or not status.get("is_playing"):
                     print("Playback stopped or no active playback")
                     break
 
-                # Detect if the currently playing song has changed
-                current_playback = self.client.sp.current_playback()
-                current_uri = None
-                if current_playback and current_playback.get("item"):
-                    current_uri = current_playback["item"].get("uri")
-
-                # If song has changed, reset injection flag
+                # If the currently playing song has changed, reset injection flag
+                current_uri = status.get("uri")
                 if current_uri and current_uri != self.last_played_uri:
-                    if self.debug_writer:
-                        self.debug_writer.log_event(
+                    if debug_writer:
+                        debug_writer.log_event(
                             "song_change",
                             {"uri": current_uri, "from_uri": self.last_played_uri},
                         )
                     self.last_played_uri = current_uri
-                    self.already_injected_for_current = False
-
-                # Sleep for poll interval
-                time.sleep(JITConfig.POLL_INTERVAL)
+                    self._inject_state = _ARMED
+
+                time_left = self.client.calculate_time_until_end(status)
+                should_inject = 0 <= time_left <= JITConfig.INJECTION_THRESHOLD
+                # Deadline for the next poll, anchored at this cycle's fetch so
+                # the work below does not stretch the cadence
+                next_poll = status["fetched_at"] + self._poll_delay(time_left)
+
+                # Most cycles land mid-track, or after this song's injection, with
+                # nothing to log: go straight back to sleep
+                if not debug_writer and (
+                    not should_inject or self._inject_state == _FIRED
+                ):
+                    self._wait_until(next_poll)
+                    continue
 
                 # Log cycle snapshot
-                if self.debug_writer:
-                    playing = {}
-                    status = self.client.get_playback_status()
-                    if status and status.get("is_playing"):
-                        track = status.get("item")
-                        if track:
-                            playing = {
-                                "title": track.get("name", ""),
-                                "artist": track["artists"][0].get("name", "")
-                                if track.get("artists")
-                                else "",
-                                "uri": track.get("uri", ""),
-                                "progress_ms": status.get("progress_ms", 0),
-                                "duration_ms": track.get("duration_ms", 0),
-                                "device": status.get("device", "") or "",
-                            }
+                if debug_writer:
+                    playing = {
+                        "title": status.get("title", ""),
+                        "artist": status.get("artist", ""),
+                        "uri": current_uri or "",
+                        "progress_ms": status.get("progress_ms", 0),
+                        "duration_ms": status.get("duration_ms", 0),
+                        "device": status.get("device", "") or "",
+                    }
 
                     shadow_queue = {
-                        "remaining": self.queue_manager.queue_length()
-                        if self.queue_manager
-                        else 0,
+                        "remaining": self.queue_manager.queue_length(),
                         "next_song": None,
                         "injected_count": 0,
                     }
-                    if self.queue_manager and not self.queue_manager.is_empty():
-                        next_song_data = self.queue_manager.peek_next_song()
-                        if next_song_data:
-                            shadow_queue["next_song"] = (
-                                f"{next_song_data[0]} by {next_song_data[1]}"
-                            )
+                    next_song_data = self.queue_manager.peek_next_song()
+                    if next_song_data:
+                        shadow_queue["next_song"] = (
+                            f"{next_song_data[0]} by {next_song_data[1]}"
+                        )
 
                     injection_state = {
-                        "should_inject": self.client.should_inject_next(),
-                        "time_until_end": self.client.calculate_time_until_end(),
-                        "already_injected": self.already_injected_for_current,
+                        "should_inject": should_inject,
+                        "time_until_end": time_left,
+                        "already_injected": self._inject_state == _FIRED,
                         "last_injected_uri": self.last_injected_uri,
                     }
 
@@ -191,70 +226,160 @@ class JITQueueSync:
                         shadow_queue=shadow_queue,
                         injection_state=injection_state,
                     )
-                    self.debug_writer.log_cycle(cycle_snapshot)
+                    debug_writer.log_cycle(cycle_snapshot)
 
                     cycle_num += 1
 
-                # Check if we should inject next song (and haven't already for this song)
+                # Check if we should inject next song (and haven't already for this song).
+                # With nothing left to inject, keep polling until playback stops
+                # in case the shadow queue is updated.
+                next_uri = None
                 if (
-                    self.client.should_inject_next()
-                    and not self.already_injected_for_current
+                    self._inject_state == _ARMED
+                    and should_inject
+                    and time.monotonic() >= self._rate_limited_until
                 ):
-                    if self.queue_manager.is_empty():
-                        print("Queue exhausted, ending session")
-                        break
-
                     next_uri = self.queue_manager.get_next_track_uri()
-                    if not next_uri:
-                        print("No more songs to inject")
-                        break
 
+                if next_uri:
                     # Try to inject with retries
                     injected = False
-                    for attempt in range(JITConfig.RETRY_ATTEMPTS):
-                        time_left = self.client.calculate_time_until_end()
-                        if self.client.inject_next_song(next_uri):
+                    rate_limited = False
+                    for attempt in range(retry_attempts):
+                        try:
+                            self.client.inject_next_song(next_uri, raise_errors=True)
+                        except Exception as e:
+                            print(f"Error injecting song {next_uri}: {e}")
+                            delay = self._retry_delay(attempt, e)
+                            if delay is None:
+                                print(
+                                    "✗ Rate limited by Spotify, pausing injections for "
+                                    f"{JITConfig.RATE_LIMIT_COOLDOWN}s"
+                                )
+                                if debug_writer:
+                                    debug_writer.log_event(
+                                        "rate_limited",
+                                        {"cooldown": JITConfig.RATE_LIMIT_COOLDOWN},
+                                    )
+                                rate_limited = True
+                                break
+                            if attempt < retry_attempts - 1:
+                                print(
+                                    f"  Retry {attempt + 1}/{retry_attempts} "
+                                    f"in {delay:.1f}s..."
+                                )
+                                # Interruptible backoff: stop_session() ends it at once
+                                if self._stop_event.wait(delay):
+                                    return
+                        else:
+                            self._consecutive_429 = 0
+                            time_left = self.client.calculate_time_until_end(status)
                             print(f"✓ Injected song (remaining: {time_left:.1f}s)")
-                            if self.debug_writer:
-                                self.debug_writer.log_event(
+                            if debug_writer:
+                                debug_writer.log_event(
                                     "injection",
                                     {"uri": next_uri, "time_left": time_left},
                                 )
                             self.queue_manager.get_next_song()  # Pop from queue
                             self.last_injected_uri = next_uri
-                            self.already_injected_for_current = (
-                                True  # Mark as injected for this song
-                            )
+                            self._inject_state = _FIRED
                             injected = True
                             break
-                        else:
-                            if attempt < JITConfig.RETRY_ATTEMPTS - 1:
-                                print(
-                                    f"  Retry {attempt + 1}/{JITConfig.RETRY_ATTEMPTS}..."
-                                )
-                                time.sleep(JITConfig.RETRY_DELAY)
 
-                    if not injected:
+                    # The rate-limit path already reported its cooldown above
+                    if not injected and not rate_limited:
                         print(
-                            f"✗ Failed to inject song after {JITConfig.RETRY_ATTEMPTS} attempts"
+                            f"✗ Failed to inject song after {retry_attempts} attempts"
                         )
-                        if self.debug_writer:
-                            self.debug_writer.log_event(
+                        if debug_writer:
+                            debug_writer.log_event(
                                 "injection_failed",
-                                {"uri": next_uri, "attempts": JITConfig.RETRY_ATTEMPTS},
+                                {"uri": next_uri, "attempts": retry_attempts},
                             )
                         # Continue anyway, will try again
 
+                self._wait_until(next_poll)
+
         except KeyboardInterrupt:
             print("\nSession interrupted by user")
         except Exception as e:
             print(f"Error in injection loop: {e}")
-            if self.debug_writer:
-                self.debug_writer.log_error(e)
+            if debug_writer:
+                debug_writer.log_error(e)
         finally:
             self.running = False
             print("Injection loop ended")
 
+    def _wait_until(self, deadline):
+        """
+        Sleep until the next poll deadline (a time.monotonic() value).
+
+        Returns early when update_shadow_queue() or stop_session() wakes the loop.
+        """
+        with self._cv:
+            if not self._stop_event.is_set() and not self._wakeup:
+                self._cv.wait(timeout=max(0.0, deadline - time.monotonic()))
+            self._wakeup = False
+
+    def _retry_delay(self, attempt, error):
+        """
+        Pick the delay before retrying a failed injection.
+
+        A 429 honours Spotify's Retry-After header and counts towards the
+        rate-limit circuit breaker; other errors back off exponentially with
+        jitter.
+
+        Args:
+            attempt (int): Zero-based attempt number that just failed
+            error (Exception): The error raised by the injection
+
+        Returns:
+            float: Seconds to wait, or None if the circuit breaker tripped and
+                   injections are paused for RATE_LIMIT_COOLDOWN seconds
+        """
+        if isinstance(error, SpotifyException) and error.http_status == 429:
+            self._consecutive_429 += 1
+            if self._consecutive_429 >= JITConfig.RATE_LIMIT_MAX_CONSECUTIVE:
+                self._consecutive_429 = 0
+                self._rate_limited_until = (
+                    time.monotonic() + JITConfig.RATE_LIMIT_COOLDOWN
+                )
+                return None
+
+            headers = error.headers or {}
+            try:
+                delay = float(headers.get("Retry-After", 1))
+            except (TypeError, ValueError):
+                delay = 1.0
+        else:
+            self._consecutive_429 = 0
+            delay = JITConfig.RETRY_DELAY * (2**attempt) + random.uniform(0, 0.3)
+
+        return min(JITConfig.RETRY_MAX_DELAY, delay)
+
+    @staticmethod
+    def _poll_delay(time_left):
+        """
+        Pick how long to sleep before the next playback poll.
+
+        Far from the end of the track the loop sleeps until about
+        1.5 * INJECTION_THRESHOLD seconds remain; inside that window it falls
+        back to POLL_INTERVAL.
+
+        Args:
+            time_left (float): Seconds until the current track ends, or -1 if unknown
+
+        Returns:
+            float: Seconds to sleep, clamped to [MIN_POLL_INTERVAL, MAX_POLL_INTERVAL]
+        """
+        threshold = JITConfig.INJECTION_THRESHOLD
+        if time_left > 2 * threshold:
+            delay = time_left - 1.5 * threshold
+        else:
+            delay = JITConfig.POLL_INTERVAL
+
+        return max(JITConfig.MIN_POLL_INTERVAL, min(JITConfig.MAX_POLL_INTERVAL, delay))
+
     def update_shadow_queue(self, new_songs_list):
         """
         Update the shadow queue immediately (while loop is running).
@@ -271,6 +396,7 @@ class JITQueueSync:
 
         print(f"Updating shadow queue with {len(new_songs_list)} new songs...")
         self.queue_manager.update_queue(new_songs_list)
+        self._wake()
         if self.debug_writer:
             self.debug_writer.log_event(
                 "queue_update", {"new_count": len(new_songs_list)}
@@ -285,7 +411,15 @@ class JITQueueSync:
         Stop the injection loop cleanly.
         """
         print("Stopping DJ session...")
-        self.running = False
+        with self._cv:
+            self._stop_event.set()
+            self._cv.notify_all()
+
+    def _wake(self):
+        """Interrupt the injection loop's current wait so it re-polls now."""
+        with self._cv:
+            self._wakeup = True
+            self._cv.notify_all()
 
     def start_injection_thread(self, max_duration_seconds=None):
         """
@@ -297,8 +431,10 @@ class JITQueueSync:
         Returns:
             threading.Thread: The injection thread
         """
+        # Cleared before the thread exists so an early stop_session() sticks
+        self._stop_event.clear()
         self.injection_thread = threading.Thread(
-            target=self.run_injection_loop, args=(max_duration_seconds,), daemon=False
+            target=self.run_injection_loop, args=(max_duration_seconds,), daemon=True
         )
         self.injection_thread.start()
         return self.injection_thread
@@ -320,6 +456,8 @@ class QueueSync:
     This class now uses the JIT system internally.
     """
 
+    __slots__ = ("client", "jit_sync")
+
     def __init__(self, spotify_client=None):
         """
         Initialize the queue sync engine.
@@ -327,7 +465,7 @@ class QueueSync:
         Args:
             spotify_client (SpotifyClient, optional): Existing SpotifyClient instance.
         """
-        self.client = spotify_client or SpotifyClient()
+        self.client = spotify_client or get_shared_client()
         self.jit_sync = JITQueueSync(self.client)
 
     def sync_queue(self, desired_queue):
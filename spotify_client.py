@@ -1,17 +1,103 @@
 """
 Spotify client for queue management and playback control.
 """
+import functools
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import spotipy
+from spotipy.cache_handler import CacheFileHandler
 from spotipy.oauth2 import SpotifyOAuth
-from config import JITConfig
+from config import JITConfig, SpotifyConfig
+from uri_cache import URICache
+
+# Fetches the queue alongside currently_playing in get_current_queue; kept for
+# the process so polling does not start and join a thread on every call
+_QUEUE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="queue-fetch")
+
+
+def _track_summary(track):
+    """Reduce a Spotify track object to {"title": ..., "artist": ...}."""
+    artists = track.get("artists")
+    return {
+        "title": track["name"],
+        "artist": artists[0]["name"] if artists else "Unknown Artist",
+    }
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may be sent."""
+
+    def __init__(self, rate, capacity):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one has refilled if the bucket is empty."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a token from a _TokenBucket before each request."""
+
+    def __init__(self, bucket, **kwargs):
+        self._bucket = bucket
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self._bucket.acquire()
+        return super().send(request, **kwargs)
+
+
+class _MemoizedTokenCache(CacheFileHandler):
+    """
+    spotipy's token file cache, read from disk once.
+
+    spotipy asks the cache handler for the token on every API call; the stock
+    CacheFileHandler re-reads and re-parses the file each time. This keeps the
+    token in memory and still writes refreshed tokens through to the file.
+    """
+
+    _UNSET = object()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._token = self._UNSET
+
+    def get_cached_token(self):
+        if self._token is self._UNSET:
+            self._token = super().get_cached_token()
+        return self._token
+
+    def save_token_to_cache(self, token_info):
+        self._token = token_info
+        super().save_token_to_cache(token_info)
 
 
 class SpotifyClient:
     """Client for interacting with Spotify's queue and playback APIs."""
 
+    __slots__ = ("_session", "sp", "uri_cache")
+
     def __init__(self):
         """Initialize Spotify client with credentials from environment variables."""
         load_dotenv()
@@ -29,15 +115,49 @@ class SpotifyClient:
         # Scope needed for queue operations and playback control
         scope = "user-read-playback-state,user-modify-playback-state"
 
+        # One keep-alive pool shared by every call on this client. spotipy's
+        # default pool holds 10 connections, fewer than the concurrent
+        # searches QueueManager runs, so size it to match. A custom session skips
+        # spotipy's own, so its retry policy is restated here in full.
+        self._session = requests.Session()
+        retry = Retry(
+            total=3,
+            connect=None,
+            read=False,
+            allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+            status=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+        )
+        # Every spotipy call goes through this adapter, so throttling here keeps
+        # bursts (e.g. a queue's worth of concurrent searches) under Spotify's
+        # rate limit instead of tripping 429s
+        bucket = _TokenBucket(
+            SpotifyConfig.RATE_LIMIT_PER_SECOND, SpotifyConfig.RATE_LIMIT_BURST
+        )
+        adapter = _RateLimitedAdapter(
+            bucket,
+            pool_connections=10,
+            pool_maxsize=SpotifyConfig.MAX_SEARCH_WORKERS,
+            max_retries=retry,
+        )
+        self._session.mount("https://", adapter)
+
         self.sp = spotipy.Spotify(
             auth_manager=SpotifyOAuth(
                 client_id=client_id,
                 client_secret=client_secret,
                 redirect_uri=redirect_uri,
                 scope=scope,
-            )
+                cache_handler=_MemoizedTokenCache(),
+            ),
+            requests_session=self._session,
         )
 
+        # Persistent (title, artist) -> URI cache consulted by search_track_cached
+        self.uri_cache = URICache(enabled=SpotifyConfig.URI_CACHE_ENABLED)
+
     def get_current_queue(self):
         """
         Fetch the current user's queue from Spotify.
@@ -48,35 +168,33 @@ class SpotifyClient:
         """
         queue_items = []
 
-        # Get currently playing track
+        # The two reads are independent: fetch the queue on a worker thread
+        # while this thread fetches the currently playing track
+        queue_future = _QUEUE_EXECUTOR.submit(self.sp.queue)
         current = self.sp.currently_playing()
+        queue = queue_future.result()
+
+        # Currently playing track
         if current and current.get("is_playing") and current.get("item"):
-            track = current["item"]
-            queue_items.append({
-                "title": track["name"],
-                "artist": track["artists"][0]["name"] if track.get("artists") else "Unknown Artist"
-            })
-
-        # Get the queue
-        queue = self.sp.queue()
+            queue_items.append(_track_summary(current["item"]))
+
+        # Queued tracks
         # TODO: if queue is full at start, we should tell user that we are going to empty it
         # meaning we should add a bool to this function
         if queue and queue.get("queue"):
-            for track in queue["queue"]:
-                queue_items.append({
-                    "title": track["name"],
-                    "artist": track["artists"][0]["name"] if track.get("artists") else "Unknown Artist"
-                })
+            queue_items.extend(map(_track_summary, queue["queue"]))
 
         return queue_items
 
-    def search_track(self, title, artist):
+    def search_track(self, title, artist, raise_errors=False):
         """
         Search for a track on Spotify given title and artist.
 
         Args:
             title (str): Track title
             artist (str): Artist name
+            raise_errors (bool): If True, API errors propagate instead of returning None,
+                                 so callers can tell "not found" apart from a failed call.
 
         Returns:
             str: Spotify track URI if found, None otherwise
@@ -91,9 +209,35 @@ class SpotifyClient:
             else:
                 return None
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error searching for track '{title}' by '{artist}': {e}")
             return None
 
+    def search_track_cached(self, title, artist):
+        """
+        Search for a track, answering from the persistent URI cache when possible.
+
+        Both hits and "not found" results are cached (the latter expire after
+        SpotifyConfig.URI_CACHE_NEGATIVE_TTL); failed API calls are not.
+
+        Args:
+            title (str): Track title
+            artist (str): Artist name
+
+        Raises:
+            Exception: If the Spotify search fails
+
+        Returns:
+            str: Spotify track URI if found, None otherwise
+        """
+        track_uri = self.uri_cache.get(title, artist)
+        if track_uri is None:
+            track_uri = self.search_track(title, artist, raise_errors=True)
+            self.uri_cache.put(title, artist, track_uri)
+
+        return track_uri or None
+
     def clear_queue(self):
         """
         Stub for queue clearing - not applicable with JIT system.
@@ -144,39 +288,65 @@ class SpotifyClient:
         """
         Get current playback status including progress and duration.
 
+        One current_playback call; the result carries everything the injection
+        loop needs for a cycle, so callers can pass it to
+        calculate_time_until_end() and should_inject_next() instead of
+        re-fetching.
+
         Returns:
-            dict: {"is_playing": bool, "progress_ms": int, "duration_ms": int, "device": str}
-                  Returns dict with all values as None/empty if no playback active
+            dict: {"is_playing": bool, "progress_ms": int, "duration_ms": int, "device": str,
+                   "uri": str, "title": str, "artist": str, "fetched_at": float}
+                  Returns dict with all values as None/empty if no playback active.
+                  fetched_at is the time.monotonic() of the request.
 
         Returns:
             None if error occurred
         """
+        fetched_at = time.monotonic()
         try:
             playback = self.sp.current_playback()
-            if not playback:
-                return {"is_playing": False, "progress_ms": 0, "duration_ms": 0, "device": None}
-
-            if not playback.get("item"):
-                return {"is_playing": False, "progress_ms": 0, "duration_ms": 0, "device": None}
-
+            if not playback or not playback.get("item"):
+                return {
+                    "is_playing": False,
+                    "progress_ms": 0,
+                    "duration_ms": 0,
+                    "device": None,
+                    "uri": None,
+                    "title": "",
+                    "artist": "",
+                    "fetched_at": fetched_at,
+                }
+
+            item = playback["item"]
+            artists = item.get("artists")
             return {
                 "is_playing": playback.get("is_playing", False),
                 "progress_ms": playback.get("progress_ms", 0),
-                "duration_ms": playback["item"].get("duration_ms", 0),
-                "device": playback.get("device", {}).get("name", "Unknown")
+                "duration_ms": item.get("duration_ms", 0),
+                "device": playback.get("device", {}).get("name", "Unknown"),
+                "uri": item.get("uri"),
+                "title": item.get("name", ""),
+                "artist": artists[0].get("name", "") if artists else "",
+                "fetched_at": fetched_at,
             }
         except Exception as e:
             print(f"Error getting playback status: {e}")
             return None
 
-    def calculate_time_until_end(self):
+    def calculate_time_until_end(self, status=None):
         """
         Calculate seconds remaining until current track ends.
 
+        Args:
+            status (dict, optional): A get_playback_status() result to reuse.
+                                     Time elapsed since it was fetched is subtracted.
+                                     If None, the status is fetched.
+
         Returns:
             float: Seconds until end of current track, or -1 if no playback
         """
-        status = self.get_playback_status()
+        if status is None:
+            status = self.get_playback_status()
         if status is None or not status.get("is_playing"):
             return -1
 
@@ -187,22 +357,29 @@ class SpotifyClient:
             return -1
 
         time_remaining_ms = duration_ms - progress_ms
+        fetched_at = status.get("fetched_at")
+        if fetched_at is not None:
+            time_remaining_ms -= (time.monotonic() - fetched_at) * 1000
         if time_remaining_ms < 0:
             return 0
 
         return time_remaining_ms / 1000.0
 
-    def should_inject_next(self):
+    def should_inject_next(self, status=None):
         """
         Check if it's time to inject the next song.
 
         Returns True if time remaining <= INJECTION_THRESHOLD seconds.
 
+        Args:
+            status (dict, optional): A get_playback_status() result to reuse.
+                                     If None, the status is fetched.
+
         Returns:
             bool: True if injection should happen now, False otherwise
         """
         try:
-            time_until_end = self.calculate_time_until_end()
+            time_until_end = self.calculate_time_until_end(status)
             if time_until_end < 0:
                 return False
 
@@ -211,12 +388,14 @@ class SpotifyClient:
             print(f"Error checking injection timing: {e}")
             return False
 
-    def inject_next_song(self, track_uri):
+    def inject_next_song(self, track_uri, raise_errors=False):
         """
         Inject the next song into the queue.
 
         Args:
             track_uri (str): Spotify track URI to inject
+            raise_errors (bool): If True, API errors propagate instead of returning False,
+                                 so callers can inspect them (e.g. a 429's Retry-After).
 
         Returns:
             bool: True if injection succeeded, False otherwise (no exception raised)
@@ -225,9 +404,23 @@ class SpotifyClient:
             self.sp.add_to_queue(track_uri)
             return True
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error injecting song {track_uri}: {e}")
             return False
 
+    def _search_song(self, song):
+        """Search for a song dict's track URI; None if it lacks a title or artist."""
+        title = song.get("title")
+        artist = song.get("artist")
+        if not title or not artist:
+            return None
+        try:
+            return self.search_track_cached(title, artist)
+        except Exception as e:
+            print(f"Error searching for track '{title}' by '{artist}': {e}")
+            return None
+
     def add_songs_to_queue(self, songs_list):
         """
         Add songs to the user's queue.
@@ -245,7 +438,13 @@ class SpotifyClient:
             print("No songs to add to queue.")
             return stats
 
-        for song in songs_list:
+        # Searches are independent, so run them concurrently over the pooled
+        # session; the adds below stay sequential to keep the queue order
+        workers = min(SpotifyConfig.MAX_SEARCH_WORKERS, len(songs_list))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            track_uris = list(executor.map(self._search_song, songs_list))
+
+        for song, track_uri in zip(songs_list, track_uris):
             title = song.get("title")
             artist = song.get("artist")
 
@@ -254,9 +453,6 @@ class SpotifyClient:
                 stats["failed"] += 1
                 continue
 
-            # Search for the track
-            track_uri = self.search_track(title, artist)
-
             if track_uri:
                 try:
                     self.sp.add_to_queue(track_uri)
@@ -272,6 +468,20 @@ class SpotifyClient:
         return stats
 
 
+@functools.cache
+def get_shared_client():
+    """
+    Return the process-wide SpotifyClient, creating it on first use.
+
+    Components that are not handed a client share this one, so the app keeps a
+    single OAuth token cache and a single connection pool.
+
+    Returns:
+        SpotifyClient: The shared client
+    """
+    return SpotifyClient()
+
+
 # Test script - uncomment to run manually
 """
 if __name__ == "__main__":
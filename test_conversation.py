@@ -86,6 +86,45 @@ def test_conversation_history():
 
     print("✓ Format matches LLM API expectations\n")
 
+    # Test 8: compact() folds old messages into the summary
+    print("Test 8: Verify compact() summarizes older messages")
+    conv.clear()
+    for i in range(5):
+        conv.add_user_message(f"Message {i}")
+    folded = []
+
+    def fake_summarize(previous, messages):
+        folded.extend(messages)
+        return previous + "|".join(m["content"] for m in messages)
+
+    assert conv.compact(fake_summarize, keep_recent=2), "Should compact when over keep_recent"
+    assert [m["content"] for m in conv.get_history()] == ["Message 3", "Message 4"]
+    assert conv.summary == "Message 0|Message 1|Message 2", "Summary should cover dropped messages"
+    assert not conv.compact(fake_summarize, keep_recent=2), "Nothing left to compact"
+    conv.clear()
+    assert conv.summary == "", "clear() should reset the summary"
+    print("✓ compact() keeps recent messages and summarizes the rest\n")
+
+    # Test 9: estimate_tokens() counts messages and the summary
+    print("Test 9: Verify estimate_tokens()")
+    conv.clear()
+    assert conv.estimate_tokens() == 0, "Empty history should estimate 0 tokens"
+    conv.add_user_message("a" * 40)
+    conv.summary = "b" * 20
+    assert conv.estimate_tokens() == 15, "Should count ~4 characters per token"
+    conv.clear()
+    print("✓ estimate_tokens() approximates history size\n")
+
+    # Test 10: commit_turn() appends a user/assistant pair
+    print("Test 10: Verify commit_turn()")
+    conv.commit_turn("Play jazz", "Suggested 3 songs")
+    assert conv.get_history() == [
+        {"role": "user", "content": "Play jazz"},
+        {"role": "assistant", "content": "Suggested 3 songs"},
+    ], "commit_turn() should append both messages in order"
+    conv.clear()
+    print("✓ commit_turn() records the whole turn\n")
+
     print("=" * 50)
     print("All tests passed! ✓")
     print("=" * 50)
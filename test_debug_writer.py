@@ -0,0 +1,96 @@
+"""
+Test script for DebugWriter.
+Verifies the background writer's output and its drop policy on logs under tmp_path.
+"""
+import json
+import threading
+import time
+
+import debug_writer
+from debug_writer import DebugWriter
+
+
+def _read_log(tmp_path):
+    """Parse every line of the single session log written under tmp_path."""
+    (log_file,) = (tmp_path / "logs").glob("session_*.jsonl")
+    return [json.loads(line) for line in log_file.read_text().splitlines()]
+
+
+class _GatedEncoder:
+    """Encoder that holds the writer thread inside encode() until released."""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def encode(self, entry):
+        self.entered.set()
+        self.release.wait(timeout=5)
+        return json.dumps(entry)
+
+
+def test_close_writes_every_entry(tmp_path, monkeypatch):
+    """Test that close() leaves every logged entry on disk as one valid JSON line."""
+    print("Testing DebugWriter output...\n")
+    monkeypatch.chdir(tmp_path)
+    writer = DebugWriter()
+
+    # Test 1: Several batches' worth of mixed entries, in order
+    print("Test 1: All entries written in order")
+    count = debug_writer._BATCH_SIZE * 3 + 5
+    for i in range(count):
+        writer.log_cycle({"cycle_num": i})
+        writer.log_event("queue_update", {"new_count": i})
+    writer.log_error(RuntimeError("boom"))
+    writer.close()
+
+    entries = _read_log(tmp_path)
+    assert len(entries) == 2 * count + 1, f"Expected {2 * count + 1} lines, got {len(entries)}"
+    assert [e["cycle_num"] for e in entries[0:-1:2]] == list(range(count))
+    assert [e["data"]["new_count"] for e in entries[1:-1:2]] == list(range(count))
+    assert entries[-1]["type"] == "error" and entries[-1]["error"] == "boom"
+    assert writer.dropped == 0
+    print("✓ Every entry is one parseable line\n")
+
+    # Test 2: A disabled writer is falsy and writes nothing
+    print("Test 2: Disabled writer")
+    disabled = DebugWriter(enabled=False)
+    assert not disabled
+    disabled.log_event("ignored", {})
+    disabled.close()
+    assert len(list((tmp_path / "logs").iterdir())) == 1
+    print("✓ Disabled writer is a no-op\n")
+
+    print("All tests passed! ✓")
+
+
+def test_full_queue_drops(tmp_path, monkeypatch):
+    """Test that a full queue counts dropped entries instead of blocking the caller."""
+    print("Testing DebugWriter drop policy...\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(debug_writer, "_MAX_PENDING", 2)
+    encoder = _GatedEncoder()
+    monkeypatch.setattr(debug_writer, "_ENCODER", encoder)
+    writer = DebugWriter()
+
+    # Test 1: With the writer stalled, entries past _MAX_PENDING are dropped
+    print("Test 1: Stalled writer")
+    writer.log_event("first", {})
+    assert encoder.entered.wait(timeout=2), "Writer thread should pick up the first entry"
+    started = time.monotonic()
+    for i in range(5):
+        writer.log_event("queued", {"i": i})
+    assert time.monotonic() - started < 1, "Logging must not wait for the writer"
+    assert writer.dropped == 3, f"Expected 3 dropped entries, got {writer.dropped}"
+    print("✓ Overflow counted in dropped\n")
+
+    # Test 2: Entries accepted before the overflow are still written
+    print("Test 2: Accepted entries survive")
+    encoder.release.set()
+    writer.close()
+    entries = _read_log(tmp_path)
+    assert [e["type"] for e in entries] == ["first", "queued", "queued"]
+    assert [e["data"]["i"] for e in entries[1:]] == [0, 1]
+    print("✓ Queued entries written after the stall\n")
+
+    print("All tests passed! ✓")
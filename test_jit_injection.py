@@ -0,0 +1,183 @@
+"""
+Test script for the JIT injection loop's timing and retry policy.
+Drives JITQueueSync against a fake Spotify client (no Spotify access needed).
+"""
+import threading
+import time
+
+from spotipy.exceptions import SpotifyException
+
+from config import JITConfig
+from queue_sync import JITQueueSync
+
+SONGS = [
+    {"title": "Blinding Lights", "artist": "The Weeknd"},
+    {"title": "Heat Waves", "artist": "Glass Animals"},
+]
+
+
+def _rate_limit_error(retry_after):
+    """A 429 as spotipy raises it, with the given Retry-After header."""
+    return SpotifyException(429, -1, "rate limited", headers={"Retry-After": retry_after})
+
+
+class _FakePlayer:
+    """Stands in for SpotifyClient: a track that is always inside the injection window."""
+
+    def __init__(self, inject_error=None, cycles=None):
+        self.inject_error = inject_error  # Raised by every inject_next_song call
+        self.cycles = cycles  # Playback stops after this many polls; None never stops
+        self.polls = 0
+        self.injected = []
+        self.inject_called = threading.Event()
+
+    def search_track_cached(self, title, artist):
+        return f"spotify:track:{title}"
+
+    def start_playback(self, uri):
+        return True
+
+    def get_playback_status(self):
+        self.polls += 1
+        if self.cycles is not None and self.polls > self.cycles:
+            return None
+        return {"is_playing": True, "uri": "spotify:track:now", "fetched_at": time.monotonic()}
+
+    def calculate_time_until_end(self, status=None):
+        return JITConfig.INJECTION_THRESHOLD / 2
+
+    def inject_next_song(self, uri, raise_errors=False):
+        self.injected.append(uri)
+        self.inject_called.set()
+        if self.inject_error is not None:
+            raise self.inject_error
+        return True
+
+
+def _session(player):
+    """JITQueueSync with SONGS loaded; the first song is already playing."""
+    jit_sync = JITQueueSync(spotify_client=player)
+    assert jit_sync.start_dj_session(SONGS), "Session should start on the fake client"
+    return jit_sync
+
+
+def test_retry_delay():
+    """Test that 429s honour Retry-After and trip the circuit breaker."""
+    print("Testing JITQueueSync._retry_delay...\n")
+    jit_sync = JITQueueSync(spotify_client=_FakePlayer())
+
+    # Test 1: Retry-After is used as the delay, capped at RETRY_MAX_DELAY
+    print("Test 1: Retry-After header")
+    assert jit_sync._retry_delay(0, _rate_limit_error("4")) == 4.0
+    jit_sync._consecutive_429 = 0
+    assert jit_sync._retry_delay(0, _rate_limit_error("600")) == JITConfig.RETRY_MAX_DELAY
+    jit_sync._consecutive_429 = 0
+    assert jit_sync._retry_delay(0, _rate_limit_error("soon")) == 1.0, "Bad header falls back to 1s"
+    jit_sync._consecutive_429 = 0
+    print("✓ Retry-After honoured and capped\n")
+
+    # Test 2: Other errors back off exponentially and reset the 429 count
+    print("Test 2: Exponential backoff for other errors")
+    jit_sync._retry_delay(0, _rate_limit_error("1"))
+    delay = jit_sync._retry_delay(2, RuntimeError("503 from Spotify"))
+    assert JITConfig.RETRY_DELAY * 4 <= delay <= JITConfig.RETRY_DELAY * 4 + 0.3
+    assert jit_sync._consecutive_429 == 0, "A non-429 error should reset the count"
+    print("✓ Backoff grows with the attempt number\n")
+
+    # Test 3: RATE_LIMIT_MAX_CONSECUTIVE 429s in a row pause injections
+    print("Test 3: Circuit breaker cooldown")
+    for attempt in range(JITConfig.RATE_LIMIT_MAX_CONSECUTIVE - 1):
+        assert jit_sync._retry_delay(attempt, _rate_limit_error("1")) == 1.0
+    before = time.monotonic()
+    assert jit_sync._retry_delay(0, _rate_limit_error("1")) is None, "Breaker should trip"
+    assert before + JITConfig.RATE_LIMIT_COOLDOWN <= jit_sync._rate_limited_until
+    assert jit_sync._rate_limited_until <= time.monotonic() + JITConfig.RATE_LIMIT_COOLDOWN
+    assert jit_sync._consecutive_429 == 0, "Tripping the breaker should restart the count"
+    print("✓ Injections paused for RATE_LIMIT_COOLDOWN\n")
+
+    print("All tests passed! ✓")
+
+
+def test_rate_limit_cooldown(monkeypatch):
+    """Test that the loop stops injecting while the circuit breaker is open."""
+    print("Testing the injection loop under sustained 429s...\n")
+    monkeypatch.setattr(JITConfig, "POLL_INTERVAL", 0)
+    monkeypatch.setattr(JITConfig, "MIN_POLL_INTERVAL", 0)
+    player = _FakePlayer(inject_error=_rate_limit_error("0"), cycles=5)
+    jit_sync = _session(player)
+
+    jit_sync.run_injection_loop()
+
+    # Every poll sits in the injection window, but only the first cycle may try
+    assert len(player.injected) == JITConfig.RATE_LIMIT_MAX_CONSECUTIVE, (
+        f"Expected {JITConfig.RATE_LIMIT_MAX_CONSECUTIVE} attempts, got {len(player.injected)}"
+    )
+    assert jit_sync._rate_limited_until > time.monotonic(), "Cooldown should still be running"
+    assert jit_sync.queue_manager.queue_length() == 1, "The song should stay queued for later"
+    print("✓ No injections attempted during the cooldown\n")
+
+    print("All tests passed! ✓")
+
+
+def test_poll_delay(monkeypatch):
+    """Test that the adaptive poll delay stays within its configured bounds."""
+    print("Testing JITQueueSync._poll_delay...\n")
+    threshold = JITConfig.INJECTION_THRESHOLD
+
+    # Test 1: Mid-track the loop sleeps until 1.5 * threshold remain
+    print("Test 1: Sleep towards the injection window")
+    assert JITQueueSync._poll_delay(2 * threshold + 10) == 0.5 * threshold + 10
+    print("✓ Long sleep away from the window\n")
+
+    # Test 2: Near the end, or with no track, the fixed interval is used
+    print("Test 2: POLL_INTERVAL near the end")
+    for time_left in (threshold, 0, -1):
+        assert JITQueueSync._poll_delay(time_left) == JITConfig.POLL_INTERVAL
+    print("✓ Fixed interval inside the window\n")
+
+    # Test 3: Both ends are clamped
+    print("Test 3: MIN_POLL_INTERVAL / MAX_POLL_INTERVAL clamp")
+    assert JITQueueSync._poll_delay(3600) == JITConfig.MAX_POLL_INTERVAL
+    monkeypatch.setattr(JITConfig, "MIN_POLL_INTERVAL", JITConfig.POLL_INTERVAL + 1)
+    assert JITQueueSync._poll_delay(threshold) == JITConfig.MIN_POLL_INTERVAL
+    print("✓ Delay clamped to the configured bounds\n")
+
+    print("All tests passed! ✓")
+
+
+def test_stop_interrupts_wait(monkeypatch):
+    """Test that stop_session() ends both the poll wait and the retry backoff at once."""
+    print("Testing stop_session() wake-ups...\n")
+
+    # Test 1: A long poll wait returns as soon as the session is stopped
+    print("Test 1: Poll wait")
+    jit_sync = JITQueueSync(spotify_client=_FakePlayer())
+    waiter = threading.Thread(target=jit_sync._wait_until, args=(time.monotonic() + 30,))
+    waiter.start()
+    time.sleep(0.05)
+    jit_sync.stop_session()
+    waiter.join(timeout=2)
+    assert not waiter.is_alive(), "stop_session() should end the poll wait"
+    print("✓ Poll wait interrupted\n")
+
+    # Test 2: A long retry backoff returns as soon as the session is stopped
+    print("Test 2: Retry backoff")
+    monkeypatch.setattr(JITConfig, "RETRY_DELAY", 30)
+    monkeypatch.setattr(JITConfig, "RETRY_MAX_DELAY", 60)
+    player = _FakePlayer(inject_error=RuntimeError("503 from Spotify"))
+    jit_sync = _session(player)
+    thread = jit_sync.start_injection_thread()
+    assert player.inject_called.wait(timeout=2), "The loop should attempt an injection"
+    started = time.monotonic()
+    jit_sync.stop_session()
+    thread.join(timeout=2)
+    assert not thread.is_alive(), "stop_session() should end the retry backoff"
+    assert time.monotonic() - started < 2
+    assert len(player.injected) == 1, "No retry should run after the stop"
+    print("✓ Retry backoff interrupted\n")
+
+    print("All tests passed! ✓")
+
+
+if __name__ == "__main__":
+    test_retry_delay()
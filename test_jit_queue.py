@@ -3,7 +3,7 @@ Comprehensive test suite for Just-In-Time (JIT) queue injection system.
 Tests basic injection, mid-session updates, and edge cases.
 """
 import time
-from spotify_client import SpotifyClient
+from spotify_client import get_shared_client
 from queue_manager import QueueManager
 from queue_sync import JITQueueSync
 from config import JITConfig
@@ -61,7 +61,7 @@ def test_spotify_client_search():
     print("="*70)
 
     try:
-        client = SpotifyClient()
+        client = get_shared_client()
 
         print("\nSearching for songs...")
 
@@ -96,7 +96,7 @@ def test_spotify_playback_status():
     print("="*70)
 
     try:
-        client = SpotifyClient()
+        client = get_shared_client()
 
         print("\nGetting playback status...")
         status = client.get_playback_status()
@@ -144,7 +144,7 @@ def test_jit_injection_simulation():
     ]
 
     try:
-        client = SpotifyClient()
+        client = get_shared_client()
         jit = JITQueueSync(client)
 
         print(f"\nStarting simulation with {len(test_songs)} songs...")
@@ -200,7 +200,7 @@ def test_queue_update_mid_session():
     ]
 
     try:
-        client = SpotifyClient()
+        client = get_shared_client()
         manager = QueueManager(initial_songs, client)
 
         print(f"\nInitial queue length: {manager.queue_length()}")
@@ -234,7 +234,7 @@ def test_edge_cases():
     print("="*70)
 
     try:
-        client = SpotifyClient()
+        client = get_shared_client()
 
         # Test 1: Empty queue
         print("\nTest 1: Empty queue")
@@ -0,0 +1,122 @@
+"""
+Test script for LLMClient's suggestion cache and prompt-cache breakpoints.
+Replaces the OpenRouter call with a canned reply (no API key or network needed).
+"""
+import json
+
+from config import LLMConfig
+from llm_client import LLMClient
+
+QUEUE = [{"title": "Blinding Lights", "artist": "The Weeknd"}]
+HISTORY = [
+    {"role": "user", "content": "I want to listen to some music"},
+    {"role": "assistant", "content": "Sure! What kind of mood are you in?"},
+]
+
+
+def _offline_client(reply):
+    """LLMClient whose _post_chat returns `reply` and records each payload sent."""
+    client = LLMClient(api_key="test-key")
+    client.payloads = []
+
+    def post_chat(payload):
+        client.payloads.append(payload)
+        return json.dumps(reply)
+
+    client._post_chat = post_chat
+    return client
+
+
+def test_suggestion_cache(monkeypatch):
+    """Test that repeat turns are answered from the LRU without another API call."""
+    print("Testing the LLM suggestion cache...\n")
+    reply = {"queue": [{"title": "Levitating", "artist": "Dua Lipa"}]}
+    client = _offline_client(reply)
+
+    # Test 1: Miss, then hit for the same (history, queue, message, summary)
+    print("Test 1: Miss then hit")
+    first = client.get_queue_suggestion(HISTORY, QUEUE, "something upbeat")
+    first[0]["title"] = "Mutated by the caller"
+    second = client.get_queue_suggestion(HISTORY, QUEUE, "something upbeat")
+    assert second == reply["queue"], "Cached answer should be unaffected by caller edits"
+    assert len(client.payloads) == 1, f"Expected 1 API call, got {len(client.payloads)}"
+    print("✓ Repeat turn served from the cache\n")
+
+    # Test 2: Any change to the key is a miss
+    print("Test 2: Different inputs miss")
+    client.get_queue_suggestion(HISTORY, QUEUE, "something calmer")
+    client.get_queue_suggestion(HISTORY[:1], QUEUE, "something upbeat")
+    client.get_queue_suggestion(HISTORY, [], "something upbeat")
+    client.get_queue_suggestion(HISTORY, QUEUE, "something upbeat", summary="likes pop")
+    assert len(client.payloads) == 5, f"Expected 5 API calls, got {len(client.payloads)}"
+    print("✓ Message, history, queue and summary are all part of the key\n")
+
+    # Test 3: Empty answers are not cached
+    print("Test 3: Empty answers are retried")
+    client = _offline_client({"queue": []})
+    for _ in range(2):
+        assert client.get_queue_suggestion(HISTORY, QUEUE, "nothing") == []
+    assert len(client.payloads) == 2, "An empty answer must not be cached"
+    print("✓ Empty answer asked again\n")
+
+    # Test 4: The least recently used entry is evicted at SUGGESTION_CACHE_SIZE
+    print("Test 4: LRU eviction")
+    monkeypatch.setattr(LLMConfig, "SUGGESTION_CACHE_SIZE", 2)
+    client = _offline_client(reply)
+    for message in ("a", "b", "a", "c"):
+        client.get_queue_suggestion(HISTORY, QUEUE, message)
+    assert len(client._suggestion_cache) == 2
+    assert len(client.payloads) == 3, "Only 'a' should have been a hit"
+    client.get_queue_suggestion(HISTORY, QUEUE, "a")
+    assert len(client.payloads) == 3, "'a' was used recently and should survive"
+    client.get_queue_suggestion(HISTORY, QUEUE, "b")
+    assert len(client.payloads) == 4, "'b' was least recently used and should be evicted"
+    print("✓ Least recently used entry evicted\n")
+
+    print("All tests passed! ✓")
+
+
+def _has_breakpoint(message):
+    """True if the message is in content-part form with an ephemeral cache_control."""
+    content = message["content"]
+    return isinstance(content, list) and content[0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_cache_breakpoints():
+    """Test that only the system prompt and the last history message are cacheable."""
+    print("Testing LLMClient._mark_cache_breakpoints...\n")
+
+    # Test 1: System prompt and last history message get cache_control
+    print("Test 1: System prompt and history breakpoints")
+    messages = [LLMClient.SYSTEM_MESSAGE.copy(), *HISTORY, {"role": "user", "content": "new"}]
+    LLMClient._mark_cache_breakpoints(messages)
+    assert [_has_breakpoint(m) for m in messages] == [True, False, True, False]
+    assert messages[0]["content"][0]["text"] == LLMClient.SYSTEM_PROMPT
+    assert messages[2]["role"] == "assistant" and messages[3] == {"role": "user", "content": "new"}
+    assert isinstance(LLMClient.SYSTEM_MESSAGE["content"], str), "Class prompt must not be rewritten"
+    print("✓ Breakpoints before the new turn only\n")
+
+    # Test 2: With no history only the system prompt is marked
+    print("Test 2: First turn")
+    messages = [LLMClient.SYSTEM_MESSAGE.copy(), {"role": "user", "content": "new"}]
+    LLMClient._mark_cache_breakpoints(messages)
+    assert [_has_breakpoint(m) for m in messages] == [True, False]
+    print("✓ New turn left uncached\n")
+
+    # Test 3: Breakpoints are sent only when explicit prompt caching is on
+    print("Test 3: Only Anthropic payloads carry breakpoints")
+    client = _offline_client({"queue": []})
+    client._explicit_prompt_cache = False
+    client.get_queue_suggestion(HISTORY, QUEUE, "plain")
+    client._explicit_prompt_cache = True
+    client.get_queue_suggestion(HISTORY, QUEUE, "cached")
+    plain, cached = (payload["messages"] for payload in client.payloads)
+    assert not any(_has_breakpoint(m) for m in plain)
+    assert [_has_breakpoint(m) for m in cached] == [True, False, True, False]
+    print("✓ cache_control follows the explicit-cache flag\n")
+
+    print("All tests passed! ✓")
+
+
+if __name__ == "__main__":
+    test_cache_breakpoints()
@@ -1,18 +1,21 @@
 """
 Test JSON extraction from various LLM response formats.
 """
+import pytest
+
 from llm_client import LLMClient
 
 
 def test_json_extraction():
     """Test JSON extraction with different formats."""
-    client = LLMClient()
+    client = LLMClient(api_key="test-key")
 
     test_cases = [
         ("Raw JSON array", '[{"title": "Song 1", "artist": "Artist 1"}]'),
         ("JSON object with queue key", '{"queue": [{"title": "Song 1", "artist": "Artist 1"}]}'),
         ("JSON in markdown code block", '```json\n[{"title": "Song 1", "artist": "Artist 1"}]\n```'),
         ("JSON with descriptive text", 'Here is the queue:\n\n```json\n[{"title": "Song 1", "artist": "Artist 1"}]\n```\n\nEnjoy!'),
+        ("JSON object wrapped in prose", 'Sure! {"queue": [{"title": "Song 1", "artist": "Artist 1"}]} Have fun.'),
     ]
 
     all_passed = True
@@ -30,7 +33,38 @@ def test_json_extraction():
     return all_passed
 
 
+def test_strict_json_extraction():
+    """Test JSON mode: the reply must be bare JSON, with no markdown or prose fallbacks."""
+    client = LLMClient(api_key="test-key")
+
+    # Bare JSON (object or array, surrounding whitespace allowed) is accepted
+    for name, test_case in [
+        ("JSON object with queue key", '{"queue": [{"title": "Song 1", "artist": "Artist 1"}]}'),
+        ("Raw JSON array", '[{"title": "Song 1", "artist": "Artist 1"}]'),
+        ("Whitespace-padded JSON", '\n  {"queue": [{"title": "Song 1", "artist": "Artist 1"}]}\n'),
+    ]:
+        result = client._extract_json_from_response(test_case, strict=True)
+        assert result["queue"] == [{"title": "Song 1", "artist": "Artist 1"}], name
+        print(f"✓ {name}: Accepted in strict mode")
+
+    # Anything the non-strict fallbacks would rescue is rejected instead
+    for name, test_case in [
+        ("JSON in markdown code block", '```json\n{"queue": [{"title": "Song 1", "artist": "Artist 1"}]}\n```'),
+        ("JSON object wrapped in prose", 'Sure! {"queue": [{"title": "Song 1", "artist": "Artist 1"}]} Have fun.'),
+        ("Plain prose", "Which decade would you like?"),
+    ]:
+        with pytest.raises(ValueError, match="not valid JSON despite JSON mode"):
+            client._extract_json_from_response(test_case, strict=True)
+        print(f"✓ {name}: Rejected in strict mode")
+
+    # Valid JSON with the wrong shape still fails validation
+    with pytest.raises(ValueError):
+        client._extract_json_from_response('{"songs": []}', strict=True)
+    print("✓ Wrong schema: Rejected in strict mode")
+
+
 if __name__ == "__main__":
+    test_strict_json_extraction()
     if test_json_extraction():
         print("\n✓ All JSON extraction tests passed!")
     else:
@@ -0,0 +1,80 @@
+"""
+Test script for the monitor's log-tailing helpers.
+Verifies partial-line carry-over and the startup tail window on in-memory logs.
+"""
+import io
+
+from monitor import read_complete_lines, seek_to_tail
+
+RECORDS = [b'{"type":"a","data":{}}', b'{"type":"bb","data":{}}', b'{"type":"ccc","data":{}}']
+LOG = b"".join(record + b"\n" for record in RECORDS)
+
+
+def test_read_complete_lines():
+    """Test that records split across reads are reassembled, never parsed half-written."""
+    print("Testing read_complete_lines...\n")
+
+    # Test 1: Nothing appended yet
+    print("Test 1: Empty read keeps the pending fragment")
+    lines, partial = read_complete_lines(io.BytesIO(b""), b'{"ty')
+    assert lines == [] and partial == b'{"ty', "Empty read should not drop the fragment"
+    print("✓ Fragment kept\n")
+
+    # Test 2: Every possible split point, including mid-record and on a newline
+    print("Test 2: Log delivered in two reads at every split point")
+    for cut in range(len(LOG) + 1):
+        f = io.BytesIO()
+        f.write(LOG[:cut])
+        f.seek(0)
+        first, partial = read_complete_lines(f, b"")
+        f.write(LOG[cut:])
+        f.seek(cut)
+        second, partial = read_complete_lines(f, partial)
+        assert first + second == RECORDS, f"Split at {cut} lost or mangled records"
+        assert partial == b"", f"Split at {cut} left a fragment behind"
+        assert all(line.endswith(b"}") for line in first), f"Split at {cut} emitted a partial line"
+    print("✓ Records reassembled at every split\n")
+
+    # Test 3: A record still being written is held back
+    print("Test 3: Unterminated record is carried over")
+    lines, partial = read_complete_lines(io.BytesIO(LOG + b'{"type":"d"'), b"")
+    assert lines == RECORDS and partial == b'{"type":"d"'
+    print("✓ Unterminated record carried over\n")
+
+    print("All tests passed! ✓")
+
+
+def test_seek_to_tail():
+    """Test that the startup window starts at a record boundary and drops only cut records."""
+    print("Testing seek_to_tail...\n")
+
+    # Test 1: Small logs are replayed from the start
+    print("Test 1: Log smaller than the window")
+    f = io.BytesIO(LOG)
+    seek_to_tail(f, len(LOG))
+    assert read_complete_lines(f, b"") == (RECORDS, b"")
+    print("✓ Whole log replayed\n")
+
+    # Test 2: For every window size, only whole records inside the window are replayed
+    print("Test 2: Window boundary at every offset")
+    for window in range(len(LOG)):
+        f = io.BytesIO(LOG)
+        seek_to_tail(f, window)
+        lines, partial = read_complete_lines(f, b"")
+        # Records that fit entirely within the last `window` bytes
+        expected, size = [], 0
+        for record in reversed(RECORDS):
+            size += len(record) + 1
+            if size > window:
+                break
+            expected.insert(0, record)
+        assert lines == expected, f"Window {window}: got {lines}, expected {expected}"
+        assert partial == b""
+    print("✓ Cut records dropped, whole records kept\n")
+
+    print("All tests passed! ✓")
+
+
+if __name__ == "__main__":
+    test_read_complete_lines()
+    test_seek_to_tail()
@@ -0,0 +1,54 @@
+"""
+Test script for QueueManager.matches.
+Resolves songs through a fake search client (no Spotify access needed).
+"""
+from queue_manager import QueueManager
+
+SONGS = [
+    {"title": "Blinding Lights", "artist": "The Weeknd"},
+    {"title": "As It Was", "artist": "Harry Styles"},
+    {"title": "Heat Waves", "artist": "Glass Animals"},
+]
+
+
+class _FakeSearch:
+    """Stands in for SpotifyClient.search_track_cached; every song is found."""
+
+    def search_track_cached(self, title, artist):
+        return f"spotify:track:{title}"
+
+
+def test_matches():
+    """Test that matches() only accepts the remaining queue in the same order."""
+    print("Testing QueueManager.matches...\n")
+    manager = QueueManager(SONGS, _FakeSearch())
+
+    # Test 1: The same songs, in any normalized spelling, match
+    print("Test 1: Identical suggestion")
+    assert manager.matches(SONGS)
+    assert manager.matches([{"title": s["title"].upper(), "artist": s["artist"]} for s in SONGS])
+    print("✓ Unchanged suggestion matches\n")
+
+    # Test 2: Reordering is a change ("play X next")
+    print("Test 2: Reordered suggestion")
+    assert not manager.matches([SONGS[1], SONGS[0], SONGS[2]])
+    print("✓ Reorder detected\n")
+
+    # Test 3: Repeats and partial lists are changes
+    print("Test 3: Duplicated or shortened suggestion")
+    assert not manager.matches([*SONGS, SONGS[0]])
+    assert not manager.matches(SONGS[:2])
+    print("✓ Duplicates and removals detected\n")
+
+    # Test 4: Only songs still waiting count
+    print("Test 4: After an injection")
+    manager.get_next_song()
+    assert manager.matches(SONGS[1:])
+    assert not manager.matches(SONGS)
+    print("✓ Compared against the remaining queue\n")
+
+    print("All tests passed! ✓")
+
+
+if __name__ == "__main__":
+    test_matches()
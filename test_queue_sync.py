@@ -1,10 +1,22 @@
 """
 Test script for QueueSync - verifies queue synchronization works correctly.
 """
-from spotify_client import SpotifyClient
+from concurrent.futures import ThreadPoolExecutor
+
+from spotify_client import get_shared_client
 from queue_sync import QueueSync
 
 
+def _format_queue(queue):
+    """Render a fetched queue as one block of lines (one stdout write per queue)."""
+    lines = [f"  1. '{queue[0]['title']}' by {queue[0]['artist']} (Now Playing)"]
+    lines.extend(
+        f"  {i}. '{track['title']}' by {track['artist']} (Position {i - 1})"
+        for i, track in enumerate(queue[1:], 2)
+    )
+    return "\n".join(lines)
+
+
 def test_queue_sync():
     """Test the QueueSync class with a sample desired queue."""
     print("=" * 60)
@@ -13,7 +25,7 @@ def test_queue_sync():
 
     # Initialize clients
     print("\nInitializing Spotify client...")
-    spotify_client = SpotifyClient()
+    spotify_client = get_shared_client()
 
     print("Initializing QueueSync engine...")
     queue_sync = QueueSync(spotify_client)
@@ -24,9 +36,7 @@ def test_queue_sync():
     current_queue = spotify_client.get_current_queue()
     if current_queue:
         print(f"Current queue has {len(current_queue)} track(s):")
-        for i, track in enumerate(current_queue, 1):
-            status = "(Now Playing)" if i == 1 else f"(Position {i-1})"
-            print(f"  {i}. '{track['title']}' by {track['artist']} {status}")
+        print(_format_queue(current_queue))
     else:
         print("No tracks currently playing or in queue.")
 
@@ -54,9 +64,7 @@ def test_queue_sync():
     updated_queue = spotify_client.get_current_queue()
     if updated_queue:
         print(f"Updated queue has {len(updated_queue)} track(s):")
-        for i, track in enumerate(updated_queue, 1):
-            status = "(Now Playing)" if i == 1 else f"(Position {i-1})"
-            print(f"  {i}. '{track['title']}' by {track['artist']} {status}")
+        print(_format_queue(updated_queue))
     else:
         print("Queue is empty.")
 
@@ -70,7 +78,7 @@ def test_search_track():
     print("Track Search Test")
     print("=" * 60)
 
-    spotify_client = SpotifyClient()
+    spotify_client = get_shared_client()
 
     test_cases = [
         ("Bohemian Rhapsody", "Queen"),
@@ -79,8 +87,13 @@ def test_search_track():
     ]
 
     print("\nSearching for tracks:")
-    for title, artist in test_cases:
-        uri = spotify_client.search_track(title, artist)
+    # Searches are independent network round-trips; run them side by side.
+    # search_track bypasses the URI cache so every run exercises Spotify search
+    # (the cache itself is covered offline by test_uri_cache.py).
+    with ThreadPoolExecutor(max_workers=len(test_cases)) as pool:
+        uris = list(pool.map(lambda case: spotify_client.search_track(*case), test_cases))
+
+    for (title, artist), uri in zip(test_cases, uris):
         if uri:
             print(f"✓ Found '{title}' by {artist}: {uri}")
         else:
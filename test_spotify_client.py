@@ -1,22 +1,32 @@
 """
 Test script for SpotifyClient - verifies queue fetching works correctly.
 """
-from spotify_client import SpotifyClient
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import spotify_client
+from config import SpotifyConfig
+from spotify_client import SpotifyClient, _RateLimitedAdapter, _TokenBucket, get_shared_client
 
 
 def test_get_current_queue():
     """Test the get_current_queue method."""
     print("Initializing Spotify client...")
-    client = SpotifyClient()
+    client = get_shared_client()
 
     print("Fetching current queue from Spotify...")
     queue = client.get_current_queue()
 
     if queue:
         print(f"\n✓ Successfully fetched {len(queue)} track(s) in queue:\n")
-        for i, track in enumerate(queue, 1):
-            status = "(Currently Playing)" if i == 1 else f"(Position {i-1} in queue)"
-            print(f"{i}. '{track['title']}' by {track['artist']} {status}")
+        lines = [f"1. '{queue[0]['title']}' by {queue[0]['artist']} (Currently Playing)"]
+        lines.extend(
+            f"{i}. '{track['title']}' by {track['artist']} (Position {i - 1} in queue)"
+            for i, track in enumerate(queue[1:], 2)
+        )
+        print("\n".join(lines))
     else:
         print("\n! No tracks currently playing or in queue.")
         print("  To test this properly, start playing music on Spotify and/or add songs to your queue.")
@@ -25,5 +35,121 @@ def test_get_current_queue():
     return queue
 
 
+def test_session_retry_policy(monkeypatch):
+    """The custom session must keep spotipy's retry policy (offline)."""
+    monkeypatch.setenv("SPOTIFY_CLIENT_ID", "test-id")
+    monkeypatch.setenv("SPOTIFY_CLIENT_SECRET", "test-secret")
+    monkeypatch.setenv("SPOTIFY_REDIRECT_URI", "http://127.0.0.1:8888/callback")
+    monkeypatch.setattr(SpotifyConfig, "URI_CACHE_ENABLED", False)
+
+    client = SpotifyClient()
+    retry = client._session.get_adapter("https://api.spotify.com/v1/me").max_retries
+
+    assert retry.total == 3
+    assert retry.status == 3
+    assert retry.backoff_factor == 0.3
+    assert set(retry.status_forcelist) == {429, 500, 502, 503, 504}
+    assert retry.respect_retry_after_header
+    for status in (429, 500, 502, 503, 504):
+        assert retry.is_retry("GET", status), f"{status} should be retried"
+    assert not retry.is_retry("GET", 404), "404 should not be retried"
+    print("✓ Session retries 429/5xx responses like spotipy's default session")
+
+
+class _FakeClock:
+    """Deterministic stand-in for time.monotonic/time.sleep; sleeping advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket(monkeypatch):
+    """Test _TokenBucket burst size, refill rate and blocking (offline)."""
+    clock = _FakeClock()
+    monkeypatch.setattr(spotify_client.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(spotify_client.time, "sleep", clock.sleep)
+
+    # Power-of-two rate keeps every refill exact in binary floating point
+    bucket = _TokenBucket(rate=4, capacity=3)
+
+    # A full bucket lets a burst of `capacity` requests through without waiting
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == [], "Burst within capacity should not block"
+
+    # The next request blocks until one token refills: 1 / rate seconds
+    bucket.acquire()
+    assert clock.sleeps == [0.25], f"Expected one 0.25s wait, got {clock.sleeps}"
+
+    # Refill accrues at `rate` per second, capped at capacity
+    clock.sleeps.clear()
+    clock.now += 0.625  # 2.5 tokens
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == [], "Refilled tokens should be spent without blocking"
+    bucket.acquire()
+    assert clock.sleeps == [0.125], "Half a token left: wait 0.125s for the rest"
+
+    clock.sleeps.clear()
+    clock.now += 60  # Far more than capacity worth of refill
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == [], "Bucket should be full again"
+    bucket.acquire()
+    assert clock.sleeps == [0.25], "Refill must be capped at capacity"
+    print("✓ Token bucket enforces burst size and refill rate")
+
+
+def test_rate_limited_adapter_takes_token(monkeypatch):
+    """Every request sent through the adapter acquires a token first (offline)."""
+    events = []
+
+    class RecordingBucket:
+        def acquire(self):
+            events.append("acquire")
+
+    monkeypatch.setattr(
+        HTTPAdapter, "send", lambda self, request, **kwargs: events.append("send")
+    )
+    adapter = _RateLimitedAdapter(RecordingBucket())
+    request = requests.Request("GET", "https://api.spotify.com/v1/me").prepare()
+    adapter.send(request)
+    adapter.send(request)
+    assert events == ["acquire", "send", "acquire", "send"]
+    print("✓ Adapter acquires a token before each send")
+
+
+def test_get_current_queue_reuses_worker():
+    """get_current_queue fetches the queue on one long-lived worker (offline)."""
+    queue_threads = []
+
+    class FakeSpotify:
+        def queue(self):
+            queue_threads.append(threading.current_thread())
+            return {"queue": [{"name": "As It Was", "artists": [{"name": "Harry Styles"}]}]}
+
+        def currently_playing(self):
+            return {"is_playing": True, "item": {"name": "Blinding Lights", "artists": []}}
+
+    client = SpotifyClient.__new__(SpotifyClient)
+    client.sp = FakeSpotify()
+    for _ in range(3):
+        assert client.get_current_queue() == [
+            {"title": "Blinding Lights", "artist": "Unknown Artist"},
+            {"title": "As It Was", "artist": "Harry Styles"},
+        ]
+    assert len(set(queue_threads)) == 1, "Every call should reuse the same worker"
+    assert queue_threads[0] is not threading.current_thread()
+    print("✓ Queue fetched on the shared worker thread")
+
+
 if __name__ == "__main__":
     test_get_current_queue()
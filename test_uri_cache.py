@@ -0,0 +1,166 @@
+"""
+Test script for URICache.
+Verifies key normalization and the SQLite-backed lookups (no Spotify access needed).
+"""
+import pytest
+
+from config import SpotifyConfig
+from spotify_client import SpotifyClient
+from uri_cache import URICache
+
+
+def test_make_key():
+    """Test that make_key only merges titles naming the same recording."""
+    print("Testing URICache.make_key...\n")
+
+    # Test 1: Case and surrounding whitespace are ignored
+    print("Test 1: Casefold and strip")
+    assert URICache.make_key("  Bohemian Rhapsody ", "QUEEN ") == "bohemian rhapsody|queen"
+    assert URICache.make_key("Straße", "X") == URICache.make_key("STRASSE", "x")
+    print("✓ Case and whitespace normalized\n")
+
+    # Test 2: Remaster/version/feat. parentheticals name the same recording
+    print("Test 2: Same-recording suffixes are dropped")
+    for title in (
+        "Song (Remastered 2011)",
+        "Song (2009 Remaster)",
+        "Song (Remastered)",
+        "Song (Album Version)",
+        "Song (Single Version)",
+        "Song (feat. Someone)",
+        "Song (feat. Someone) (Remastered 2011)",
+    ):
+        assert URICache.make_key(title, "Artist") == "song|artist", f"{title!r} should match 'Song'"
+    print("✓ Remaster, version and feat. suffixes dropped\n")
+
+    # Test 3: Other parentheticals are different recordings and keep their own key
+    print("Test 3: Different recordings keep distinct keys")
+    titles = [
+        "Song",
+        "Song (Live)",
+        "Song (Acoustic)",
+        "Song (X Remix)",
+        "Song (Acoustic Version)",
+    ]
+    keys = [URICache.make_key(title, "Artist") for title in titles]
+    assert len(set(keys)) == len(titles), f"Keys should be distinct: {keys}"
+    assert URICache.make_key("Song (Live) (Remastered)", "Artist") == "song (live)|artist"
+    print("✓ Live/acoustic/remix variants are not merged\n")
+
+    # Test 4: Unbracketed feat./ft. credits are dropped only with the period
+    print("Test 4: Unbracketed featured-artist credits")
+    for title in ("Song feat. Someone", "Song ft. Someone", "Song FEAT. A & B", "Song feat. X (Remastered)"):
+        assert URICache.make_key(title, "Artist") == "song|artist", f"{title!r} should match 'Song'"
+    for title, expected in (
+        ("Song Ft Me", "song ft me"),
+        ("Sweet Feat Of Clay", "sweet feat of clay"),
+        ("Defeat. The Night", "defeat. the night"),
+        ("Feat. Song", "feat. song"),
+    ):
+        assert URICache.make_key(title, "Artist") == f"{expected}|artist", f"{title!r} should be kept whole"
+    print("✓ feat./ft. credits dropped, title words kept\n")
+
+    print("All tests passed! ✓")
+
+
+class _FakeSpotify:
+    """Stands in for spotipy.Spotify.search; counts calls and can fail on demand."""
+
+    def __init__(self, results):
+        self.results = results  # query -> track URI, None for "not found", or an Exception
+        self.calls = 0
+
+    def search(self, q, type, limit):
+        self.calls += 1
+        result = self.results[q]
+        if isinstance(result, Exception):
+            raise result
+        if result is None:
+            return {"tracks": {"items": []}}
+        return {"tracks": {"items": [{"uri": result}]}}
+
+
+def _offline_client(cache, results):
+    """SpotifyClient wired to a fake search API and the given cache (no OAuth)."""
+    client = SpotifyClient.__new__(SpotifyClient)
+    client.sp = _FakeSpotify(results)
+    client.uri_cache = cache
+    return client
+
+
+def test_cache_lookups(tmp_path, monkeypatch):
+    """Test get/put on a SQLite database under tmp_path."""
+    print("Testing URICache lookups...\n")
+    db_path = str(tmp_path / "uri_cache.sqlite3")
+
+    # Test 1: Miss, then hit after put, under any key-equivalent spelling
+    print("Test 1: Miss then hit")
+    cache = URICache(path=db_path)
+    assert cache.get("Imagine", "John Lennon") is None, "Empty cache should miss"
+    cache.put("Imagine", "John Lennon", "spotify:track:imagine")
+    assert cache.get("imagine ", "JOHN LENNON") == "spotify:track:imagine"
+    print("✓ Stored URI returned for the normalized key\n")
+
+    # Test 2: Entries survive reopening the database
+    print("Test 2: Persistence across instances")
+    cache.close()
+    cache = URICache(path=db_path)
+    assert cache.get("Imagine", "John Lennon") == "spotify:track:imagine"
+    print("✓ Entries persist on disk\n")
+
+    # Test 3: "Not found" is cached as "" until the negative TTL expires
+    print("Test 3: Negative entries and their TTL")
+    cache.put("Fake Song XYZ", "Fake Artist", None)
+    assert cache.get("Fake Song XYZ", "Fake Artist") == "", "Negative entry should be cached"
+    monkeypatch.setattr(SpotifyConfig, "URI_CACHE_NEGATIVE_TTL", -1)
+    assert cache.get("Fake Song XYZ", "Fake Artist") is None, "Expired negative entry should miss"
+    assert cache.get("Imagine", "John Lennon") == "spotify:track:imagine", "Hits never expire"
+    print("✓ Negative entries expire, hits do not\n")
+
+    # Test 4: A disabled cache stores nothing
+    print("Test 4: Disabled cache")
+    disabled = URICache(enabled=False)
+    disabled.put("Imagine", "John Lennon", "spotify:track:imagine")
+    assert disabled.get("Imagine", "John Lennon") is None
+    print("✓ Disabled cache always misses\n")
+
+    cache.close()
+    print("All tests passed! ✓")
+
+
+def test_search_track_cached(tmp_path):
+    """Test that search_track_cached caches results but not API failures."""
+    print("Testing SpotifyClient.search_track_cached...\n")
+    cache = URICache(path=str(tmp_path / "uri_cache.sqlite3"))
+    client = _offline_client(
+        cache,
+        {
+            "Imagine John Lennon": "spotify:track:imagine",
+            "Fake Song XYZ Fake Artist": None,
+            "Heat Waves Glass Animals": RuntimeError("503 from Spotify"),
+        },
+    )
+
+    # Test 1: Found and not-found results are each searched once
+    print("Test 1: Results are cached")
+    for _ in range(2):
+        assert client.search_track_cached("Imagine", "John Lennon") == "spotify:track:imagine"
+        assert client.search_track_cached("Fake Song XYZ", "Fake Artist") is None
+    assert client.sp.calls == 2, f"Expected 2 searches, got {client.sp.calls}"
+    print("✓ Repeat lookups answered from the cache\n")
+
+    # Test 2: A failed API call propagates and leaves no entry behind
+    print("Test 2: API failures are not cached")
+    with pytest.raises(RuntimeError):
+        client.search_track_cached("Heat Waves", "Glass Animals")
+    assert cache.get("Heat Waves", "Glass Animals") is None, "Failure must not be cached"
+    client.sp.results["Heat Waves Glass Animals"] = "spotify:track:heatwaves"
+    assert client.search_track_cached("Heat Waves", "Glass Animals") == "spotify:track:heatwaves"
+    print("✓ Failed search retried on the next lookup\n")
+
+    cache.close()
+    print("All tests passed! ✓")
+
+
+if __name__ == "__main__":
+    test_make_key()
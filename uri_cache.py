@@ -0,0 +1,136 @@
+"""
+Persistent (title, artist) -> Spotify URI cache backed by SQLite.
+
+Lets repeat suggestions across turns and sessions skip the Spotify search call.
+Songs that were searched but not found are stored as a negative entry with a
+shorter TTL so they do not hit the API on every turn either.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from config import SpotifyConfig
+
+# Trailing parentheticals that name the same recording, such as " (Remastered 2011)",
+# " (2009 Remaster)", " (Album Version)" or " (feat. X)". Anything else, e.g.
+# " (Live)", " (Acoustic)" or " (X Remix)", is a different recording and stays.
+_SAME_RECORDING_SUFFIX_RE = re.compile(
+    r"(?:\s*\((?:[^()]*\bremaster[^()]*|(?:album|single|original) version"
+    r"|(?:feat|ft)\.\s[^()]*)\))+\s*$",
+    re.IGNORECASE,
+)
+
+# Unbracketed featured-artist credit such as " feat. X" or " ft. X". The period
+# is required so title words like "Feat" or "Ft" are left alone.
+_FEAT_SUFFIX_RE = re.compile(r"\s+(?:feat\.|ft\.)\s.*$", re.IGNORECASE)
+
+
+class URICache:
+    """Thread-safe SQLite cache of resolved Spotify track URIs."""
+
+    def __init__(self, path=None, enabled=True):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str, optional): Database file path. Defaults to SpotifyConfig.URI_CACHE_PATH.
+            enabled (bool): If False, all methods are no-ops and every lookup misses.
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if self.enabled:
+            path = path or SpotifyConfig.URI_CACHE_PATH
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Lookups come from QueueManager's search worker threads
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS uri_cache "
+                "(key TEXT PRIMARY KEY, uri TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(title, artist):
+        """
+        Build the normalized cache key for a song.
+
+        Args:
+            title (str): Track title
+            artist (str): Artist name
+
+        Returns:
+            str: "title|artist", casefolded, with remaster/version and
+                 featured-artist suffixes dropped from the title so
+                 "Song (Remastered 2011)" and "Song feat. X" both match "Song"
+                 while "Song (Live)" keeps its own key
+        """
+        title = _FEAT_SUFFIX_RE.sub("", _SAME_RECORDING_SUFFIX_RE.sub("", title))
+        return f"{title.strip().casefold()}|{artist.strip().casefold()}"
+
+    def get(self, title, artist):
+        """
+        Look up a cached URI.
+
+        Args:
+            title (str): Track title
+            artist (str): Artist name
+
+        Returns:
+            str: The track URI on a hit, "" for a cached "not found", or None on a miss.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT uri, ts FROM uri_cache WHERE key = ?",
+                (self.make_key(title, artist),),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        uri, ts = row
+        if not uri and time.time() - ts > SpotifyConfig.URI_CACHE_NEGATIVE_TTL:
+            return None
+        return uri
+
+    def put(self, title, artist, uri):
+        """
+        Store a search result.
+
+        Args:
+            title (str): Track title
+            artist (str): Artist name
+            uri (str): Track URI, or None if the search found nothing
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO uri_cache (key, uri, ts) VALUES (?, ?, ?)",
+                    (self.make_key(title, artist), uri or "", int(time.time())),
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error writing URI cache: {e}")
+
+    def close(self):
+        """Close the database connection."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None